@@ -21,12 +21,16 @@ class BirthdayCog(commands.Cog):
         """Check for birthdays daily"""
         now = datetime.now()
         
+        # Get today's birthdays for every guild in one query
+        try:
+            birthdays = await self.bot.db.get_all_birthdays_for_date(now.month, now.day)
+        except Exception as e:
+            print(f"Error checking birthdays: {e}")
+            return
+        
         for guild in self.bot.guilds:
             try:
-                # Get today's birthdays
-                users_with_birthdays = await self.bot.db.get_birthdays_for_date(
-                    guild.id, now.month, now.day
-                )
+                users_with_birthdays = birthdays.get(guild.id)
                 
                 if users_with_birthdays:
                     await self._announce_birthdays(guild, users_with_birthdays)
@@ -175,13 +179,7 @@ class BirthdayCog(commands.Cog):
         target_user = user or interaction.user
         
         # Get birthday from database
-        import aiosqlite
-        async with aiosqlite.connect(self.bot.db.db_file) as db:
-            async with db.execute(
-                'SELECT birth_month, birth_day FROM user_birthdays WHERE user_id = ? AND guild_id = ?',
-                (target_user.id, interaction.guild.id)
-            ) as cursor:
-                result = await cursor.fetchone()
+        result = await self.bot.db.get_user_birthday(target_user.id, interaction.guild.id)
         
         if not result:
             embed = discord.Embed(
@@ -289,13 +287,7 @@ class BirthdayCog(commands.Cog):
     @app_commands.command(name="removebirthday", description="Remove your birthday")
     async def removebirthday(self, interaction: discord.Interaction):
         """Remove user's birthday"""
-        import aiosqlite
-        async with aiosqlite.connect(self.bot.db.db_file) as db:
-            await db.execute(
-                'DELETE FROM user_birthdays WHERE user_id = ? AND guild_id = ?',
-                (interaction.user.id, interaction.guild.id)
-            )
-            await db.commit()
+        await self.bot.db.remove_user_birthday(interaction.user.id, interaction.guild.id)
         
         # Update permanent birthday post if configured
         await self._update_permanent_post(interaction.guild.id)
@@ -311,15 +303,8 @@ class BirthdayCog(commands.Cog):
     @app_commands.command(name="allbirthdays", description="Show all birthdays in chronological order")
     async def allbirthdays(self, interaction: discord.Interaction):
         """Show all birthdays in the server sorted chronologically"""
-        import aiosqlite
-        
         # Get all birthdays for the guild
-        async with aiosqlite.connect(self.bot.db.db_file) as db:
-            async with db.execute(
-                'SELECT user_id, birth_month, birth_day FROM user_birthdays WHERE guild_id = ? ORDER BY birth_month, birth_day',
-                (interaction.guild.id,)
-            ) as cursor:
-                birthdays = await cursor.fetchall()
+        birthdays = await self.bot.db.get_guild_birthdays(interaction.guild.id)
         
         if not birthdays:
             embed = discord.Embed(
@@ -447,15 +432,8 @@ class BirthdayCog(commands.Cog):
     
     async def _generate_permanent_birthday_embed(self, guild_id: int) -> discord.Embed:
         """Generate the embed for the permanent birthday post"""
-        import aiosqlite
-        
         # Get all birthdays for the guild
-        async with aiosqlite.connect(self.bot.db.db_file) as db:
-            async with db.execute(
-                'SELECT user_id, birth_month, birth_day FROM user_birthdays WHERE guild_id = ? ORDER BY birth_month, birth_day',
-                (guild_id,)
-            ) as cursor:
-                birthdays = await cursor.fetchall()
+        birthdays = await self.bot.db.get_guild_birthdays(guild_id)
         
         embed = discord.Embed(
             title="🎂 Server Birthdays",
@@ -8,6 +8,11 @@ import google.generativeai as genai
 from config import Config
 import asyncio
 
+# Dice notation: count, die size and an optional +/- modifier (e.g. 2d6+3)
+_DICE_RE = re.compile(r'(\d+)d(\d+)([+-]\d+)?')
+# Die size of the first group in a notation
+_DIE_SIZE_RE = re.compile(r'd(\d+)')
+
 
 class DnDCog(commands.Cog):
     """D&D related functionality including dice rolling and action parsing"""
@@ -33,8 +38,7 @@ class DnDCog(commands.Cog):
         Returns: (individual_rolls, total, breakdown_string)
         """
         # Parse dice notation using strict full-match regex
-        pattern = r'^(\d+)d(\d+)([+-]\d+)?$'
-        match = re.fullmatch(pattern, dice_string.strip().lower().replace(' ', ''))
+        match = _DICE_RE.fullmatch(dice_string.strip().lower().replace(' ', ''))
         
         if not match:
             raise ValueError(f"Invalid dice notation: {dice_string}")
@@ -49,8 +53,8 @@ class DnDCog(commands.Cog):
         if die_size <= 0 or die_size > 1000:
             raise ValueError("Die size must be between 1 and 1000")
         
-        # Roll the dice
-        rolls = [random.randint(1, die_size) for _ in range(num_dice)]
+        # Roll the dice; one choices() call draws every die without a Python-level loop
+        rolls = random.choices(range(1, die_size + 1), k=num_dice)
         dice_total = sum(rolls)
         final_total = dice_total + modifier
         
@@ -168,11 +172,10 @@ Analysis:
                 return None
 
             # Strict dice notation validation (single group with optional +/- modifier)
-            simple_pattern = r"^\s*(\d+)d(\d+)([+-]\d+)?\s*$"
-            match = re.match(simple_pattern, cleaned_lower)
+            match = _DICE_RE.fullmatch(cleaned_lower)
             if not match:
                 # Try to extract the first valid dice token if model added extras
-                token_match = re.search(r"(\d+)d(\d+)([+-]\d+)?", cleaned_lower)
+                token_match = _DICE_RE.search(cleaned_lower)
                 if not token_match:
                     return None
                 cleaned_lower = token_match.group(0)
@@ -225,7 +228,7 @@ Analysis:
             
             # Add critical hit detection for damage rolls
             if any(die_size in dice_notation for die_size in ['d6', 'd8', 'd10', 'd12']):
-                max_possible = dice_notation.count('d') * int(re.search(r'd(\d+)', dice_notation).group(1))
+                max_possible = dice_notation.count('d') * int(_DIE_SIZE_RE.search(dice_notation).group(1))
                 if total >= max_possible * 0.9:  # 90% or higher of max damage
                     embed.add_field(name="🔥", value="**Excellent damage!**", inline=False)
                     embed.color = discord.Color.gold()
@@ -81,17 +81,7 @@ class FactsCog(commands.Cog):
     
     async def _has_posted_today(self, guild_id: int, content_type: str) -> bool:
         """Check if content of a certain type has been posted today for a guild."""
-        import aiosqlite
-        async with aiosqlite.connect(self.bot.db.db_file) as db:
-            async with db.execute('''
-                SELECT 1 FROM recent_content 
-                WHERE guild_id = ? 
-                AND content_type = ? 
-                AND posted_date = DATE('now')
-                LIMIT 1
-            ''', (guild_id, content_type)) as cursor:
-                row = await cursor.fetchone()
-                return row is not None
+        return await self.bot.db.has_posted_today(guild_id, content_type)
 
     @tasks.loop(minutes=1)
     async def daily_fact(self):
@@ -221,36 +211,11 @@ class FactsCog(commands.Cog):
     async def _store_recent_content(self, guild_id: int, content: str):
         """Store recently posted content to avoid repetition"""
         logger.info(f"Storing recent content for guild {guild_id}: {content}")
-        import aiosqlite
-        async with aiosqlite.connect(self.bot.db.db_file) as db:
-            await db.execute('''
-                INSERT OR REPLACE INTO recent_content (guild_id, content_type, content, posted_date)
-                VALUES (?, 'fact', ?, DATE('now'))
-            ''', (guild_id, content))
-            
-            # Clean up old content (keep only last 30 days)
-            # await db.execute('''
-            #     DELETE FROM recent_content 
-            #     WHERE content_type = 'fact' 
-            #     AND guild_id = ? 
-            #     AND posted_date < DATE('now', '-30 days')
-            # ''', (guild_id,))
-            
-            await db.commit()
+        await self.bot.db.add_recent_content(guild_id, 'fact', content)
     
     async def _get_recent_facts(self) -> list:
         """Get recently posted facts to avoid repetition"""
-        import aiosqlite
-        async with aiosqlite.connect(self.bot.db.db_file) as db:
-            async with db.execute('''
-                SELECT content FROM recent_content 
-                WHERE content_type = 'fact' 
-                AND posted_date > DATE('now', '-60 days')
-                ORDER BY posted_date DESC
-                LIMIT 50
-            ''') as cursor:
-                rows = await cursor.fetchall()
-                return [row[0] for row in rows]
+        return await self.bot.db.get_recent_content('fact')
     
     @app_commands.command(name="fact", description="Get a random fun fact")
     async def fact_command(self, interaction: discord.Interaction):
@@ -47,13 +47,8 @@ class GeographicCog(commands.Cog):
         region = self.region_emojis[emoji_str]
         
         if added:
-            # Remove user's previous selections for this poll
-            await self.bot.db.remove_user_geographic_selection(
-                payload.user_id, payload.message_id, payload.guild_id
-            )
-            
-            # Add new selection
-            await self.bot.db.add_geographic_selection(
+            # Replace user's previous selection for this poll
+            await self.bot.db.replace_geographic_selection(
                 payload.user_id, payload.message_id, payload.guild_id, region
             )
             
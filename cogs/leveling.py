@@ -40,20 +40,13 @@ class LevelingCog(commands.Cog):
         
     #     self.user_cooldowns[user_key] = current_time
         
-    #     # Get user's current data
-    #     user_data = await self.bot.db.get_user_level_data(message.author.id, message.guild.id)
-    #     old_level = user_data['level'] if user_data else 1
-        
     #     # Award XP
     #     xp_amount = config.get('xp_per_message', 15)
-    #     await self.bot.db.update_user_xp(message.author.id, message.guild.id, xp_amount)
+    #     result = await self.bot.db.update_user_xp(message.author.id, message.guild.id, xp_amount)
         
     #     # Check for level up
-    #     new_data = await self.bot.db.get_user_level_data(message.author.id, message.guild.id)
-    #     new_level = new_data['level']
-        
-    #     if new_level > old_level:
-    #         await self._handle_level_up(message, new_level, config)
+    #     if result['leveled_up']:
+    #         await self._handle_level_up(message, result['level'], config)
     
     async def _handle_level_up(self, message, new_level, config):
         """Handle level up notifications"""
@@ -213,15 +206,7 @@ class LevelingCog(commands.Cog):
             await interaction.response.send_message("XP amount must be positive!", ephemeral=True)
             return
         
-        # Get old level
-        user_data = await self.bot.db.get_user_level_data(user.id, interaction.guild.id)
-        old_level = user_data['level'] if user_data else 1
-        
-        await self.bot.db.update_user_xp(user.id, interaction.guild.id, amount)
-        
-        # Check for level up
-        new_data = await self.bot.db.get_user_level_data(user.id, interaction.guild.id)
-        new_level = new_data['level']
+        result = await self.bot.db.update_user_xp(user.id, interaction.guild.id, amount)
         
         embed = discord.Embed(
             title="✅ XP Added",
@@ -229,8 +214,8 @@ class LevelingCog(commands.Cog):
             color=discord.Color.green()
         )
         
-        if new_level > old_level:
-            embed.add_field(name="Level Up!", value=f"Level {old_level} → {new_level}", inline=False)
+        if result['leveled_up']:
+            embed.add_field(name="Level Up!", value=f"Level {result['old_level']} → {result['level']}", inline=False)
         
         await interaction.response.send_message(embed=embed)
     
@@ -278,14 +263,8 @@ class LevelingCog(commands.Cog):
                 color=discord.Color.orange()
             )
         else:
-            # Reset all users - this requires a direct database operation
-            import aiosqlite
-            async with aiosqlite.connect(self.bot.db.db_file) as db:
-                await db.execute(
-                    'DELETE FROM user_levels WHERE guild_id = ?',
-                    (interaction.guild.id,)
-                )
-                await db.commit()
+            # Reset all users
+            await self.bot.db.reset_guild_levels(interaction.guild.id)
             
             embed = discord.Embed(
                 title="✅ XP Reset",
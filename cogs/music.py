@@ -3,10 +3,12 @@ from discord.ext import commands
 from discord import app_commands
 import asyncio
 import yt_dlp
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Deque, List
 import logging
 import os
 import time
+from collections import deque
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +39,7 @@ def build_ytdl() -> yt_dlp.YoutubeDL:
 
 class GuildMusicState:
     def __init__(self) -> None:
-        self.queue: List[Dict] = []
+        self.queue: Deque[Dict] = deque()
         self.current: Optional[Dict] = None
         self.volume: float = 0.5
         self.announce_channel_id: Optional[int] = None
@@ -49,7 +51,18 @@ class GuildMusicState:
     def next(self) -> Optional[Dict]:
         if not self.queue:
             return None
-        return self.queue.pop(0)
+        return self.queue.popleft()
+
+    def peek(self) -> Optional[Dict]:
+        return self.queue[0] if self.queue else None
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict]:
+        return list(islice(self.queue, limit))
+
+    def remove_at(self, index: int) -> Dict:
+        item = self.queue[index]
+        del self.queue[index]
+        return item
 
     def clear(self) -> None:
         self.queue.clear()
@@ -345,7 +358,7 @@ class MusicCog(commands.Cog):
             embed.add_field(name="Now Playing", value=f"**{st.current.get('title','Unknown')}**", inline=False)
         if st.queue:
             lines = []
-            for idx, it in enumerate(st.queue[:10], 1):
+            for idx, it in enumerate(st.snapshot(10), 1):
                 lines.append(f"{idx}. {it.get('title','Unknown')} ({st.fmt_duration(it.get('duration'))})")
             if len(st.queue) > 10:
                 lines.append(f"... and {len(st.queue) - 10} more")
@@ -360,7 +373,7 @@ class MusicCog(commands.Cog):
         if position < 1 or position > len(st.queue):
             await interaction.response.send_message("Invalid queue position!", ephemeral=True)
             return
-        removed = st.queue.pop(position - 1)
+        removed = st.remove_at(position - 1)
         await interaction.response.send_message(f"🗑️ Removed **{removed.get('title','Unknown')}** from queue")
 
     @app_commands.command(name="nowplaying", description="Show currently playing song")
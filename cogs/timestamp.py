@@ -1,52 +1,110 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Tuple, List
 import re
-import pytz
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+# Time-only patterns
+# 10pm, 10 pm, 10PM, 3:30, 15:00, 10 PM, etc.
+_TIME_PATTERNS = [
+    r'\b(\d{1,2})\s*(am|pm|AM|PM)\b',  # 10pm, 10 pm
+    r'\b(\d{1,2}):(\d{2})\s*(am|pm|AM|PM)?\b',  # 3:30, 3:30pm, 15:00
+]
+
+# Date-only patterns
+# Dec 5, December 5th, 12/25, 12-25, etc.
+_DATE_PATTERNS = [
+    r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})(?:st|nd|rd|th)?\b',  # Dec 5, December 5th
+    r'\b(\d{1,2})[/-](\d{1,2})\b',  # 12/25, 12-25
+]
+
+# Combined patterns
+# Dec 5 at 3pm, tomorrow at 10am, etc.
+_COMBINED_PATTERNS = [
+    r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})(?:st|nd|rd|th)?\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|AM|PM)\b',  # Dec 5 at 3pm
+    r'\b(\d{1,2})[/-](\d{1,2})\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|AM|PM)\b',  # 12/25 at 3pm
+    r'\b(tomorrow|today)\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|AM|PM)\b',  # tomorrow at 10am
+]
+
+# Compiled once at import; every message is matched against these
+_PATTERNS = {
+    'time': tuple(re.compile(p, re.IGNORECASE) for p in _TIME_PATTERNS),
+    'date': tuple(re.compile(p, re.IGNORECASE) for p in _DATE_PATTERNS),
+    'combined': tuple(re.compile(p, re.IGNORECASE) for p in _COMBINED_PATTERNS),
+}
+
+# All patterns in one alternation, most specific category first; lastgroup names the category
+_ANY_PATTERN = re.compile(
+    '|'.join(
+        f"(?P<{kind}>{'|'.join(f'(?:{p})' for p in patterns)})"
+        for kind, patterns in (('combined', _COMBINED_PATTERNS), ('date', _DATE_PATTERNS), ('time', _TIME_PATTERNS))
+    ),
+    re.IGNORECASE
+)
+
+# Every pattern above needs at least one digit, so text without one can't match
+_ANY_DIGIT = re.compile(r'\d')
+
+# Discord timestamp styles: short time, long date, short date/time
+_TIMESTAMP_FORMATS = {'time': 't', 'date': 'D', 'combined': 'f'}
+
+# Static replies, built once and never mutated
+_INVALID_TZ_MSG = (
+    f"❌ Invalid timezone! Please use a valid timezone name like:\n"
+    f"`America/New_York`, `Europe/London`, `Asia/Tokyo`, `America/Los_Angeles`, etc.\n"
+    f"You can find a list at: https://en.wikipedia.org/wiki/List_of_tz_database_time_zones"
+)
+_NO_TZ_EMBED = discord.Embed(
+    title="⏰ Timezone",
+    description="You haven't set your timezone yet.\n"
+               "Use `/set-timezone` to configure it so I can convert times for you!",
+    color=discord.Color.orange()
+)
+
+# Parsed timestamps kept per cog, least recently used evicted first
+_PARSE_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=1)
+def _timezones_by_folded_name() -> dict:
+    """Every IANA zone name keyed by its case-folded form, scanned from disk once on first use"""
+    return {name.casefold(): name for name in available_timezones()}
+
+
+def _canonical_timezone(name: str) -> Optional[str]:
+    """The IANA spelling of a zone name given in any case, or None if there is no such zone"""
+    # pytz matched names case-insensitively, so stored names like 'america/new_york' exist
+    return _timezones_by_folded_name().get(name.casefold())
+
+
+@lru_cache(maxsize=64)
+def _get_tz(name: str):
+    """ZoneInfo for a zone name in any case, memoized (unknown names still raise every time)"""
+    return ZoneInfo(_canonical_timezone(name) or name)
+
 
 class TimestampCog(commands.Cog):
     """Timestamp conversion system for detecting and converting time/date patterns"""
     
     def __init__(self, bot):
         self.bot = bot
+        # Parsed timestamps keyed by (pattern, groups, timezone, local date)
+        self._parse_cache: "OrderedDict[tuple, int]" = OrderedDict()
     
     def _compile_patterns(self):
-        """Compile regex patterns for time/date detection"""
-        # Time-only patterns
-        # 10pm, 10 pm, 10PM, 3:30, 15:00, 10 PM, etc.
-        time_patterns = [
-            r'\b(\d{1,2})\s*(am|pm|AM|PM)\b',  # 10pm, 10 pm
-            r'\b(\d{1,2}):(\d{2})\s*(am|pm|AM|PM)?\b',  # 3:30, 3:30pm, 15:00
-        ]
-        
-        # Date-only patterns
-        # Dec 5, December 5th, 12/25, 12-25, etc.
-        date_patterns = [
-            r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})(?:st|nd|rd|th)?\b',  # Dec 5, December 5th
-            r'\b(\d{1,2})[/-](\d{1,2})\b',  # 12/25, 12-25
-        ]
-        
-        # Combined patterns
-        # Dec 5 at 3pm, tomorrow at 10am, etc.
-        combined_patterns = [
-            r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})(?:st|nd|rd|th)?\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|AM|PM)\b',  # Dec 5 at 3pm
-            r'\b(\d{1,2})[/-](\d{1,2})\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|AM|PM)\b',  # 12/25 at 3pm
-            r'\b(tomorrow|today)\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm|AM|PM)\b',  # tomorrow at 10am
-        ]
-        
-        return {
-            'time': [re.compile(p, re.IGNORECASE) for p in time_patterns],
-            'date': [re.compile(p, re.IGNORECASE) for p in date_patterns],
-            'combined': [re.compile(p, re.IGNORECASE) for p in combined_patterns]
-        }
+        """Return the regex patterns for time/date detection"""
+        return _PATTERNS
     
-    def _parse_time(self, match, timezone_str: str) -> Optional[int]:
+    def _parse_time(self, match, timezone_str: str, now: Optional[datetime] = None) -> Optional[int]:
         """Parse a time pattern and return Unix timestamp"""
         try:
-            tz = pytz.timezone(timezone_str)
-            now = datetime.now(tz)
+            tz = _get_tz(timezone_str)
+            if now is None:
+                now = datetime.now(tz)
             
             groups = match.groups()
             
@@ -100,11 +158,12 @@ class TimestampCog(commands.Cog):
             print(f"Error parsing time: {e}")
             return None
     
-    def _parse_date(self, match, timezone_str: str) -> Optional[int]:
+    def _parse_date(self, match, timezone_str: str, now: Optional[datetime] = None) -> Optional[int]:
         """Parse a date pattern and return Unix timestamp"""
         try:
-            tz = pytz.timezone(timezone_str)
-            now = datetime.now(tz)
+            tz = _get_tz(timezone_str)
+            if now is None:
+                now = datetime.now(tz)
             
             groups = match.groups()
             month_names = {
@@ -136,9 +195,9 @@ class TimestampCog(commands.Cog):
                     
                     # If date has passed this year, assume next year
                     try:
-                        dt = tz.localize(datetime(year, month, day))
+                        dt = datetime(year, month, day, tzinfo=tz)
                         if dt < now:
-                            dt = tz.localize(datetime(year + 1, month, day))
+                            dt = datetime(year + 1, month, day, tzinfo=tz)
                         return int(dt.timestamp())
                     except ValueError:
                         return None
@@ -153,9 +212,9 @@ class TimestampCog(commands.Cog):
                         
                         year = now.year
                         try:
-                            dt = tz.localize(datetime(year, month, day))
+                            dt = datetime(year, month, day, tzinfo=tz)
                             if dt < now:
-                                dt = tz.localize(datetime(year + 1, month, day))
+                                dt = datetime(year + 1, month, day, tzinfo=tz)
                             return int(dt.timestamp())
                         except ValueError:
                             return None
@@ -166,11 +225,12 @@ class TimestampCog(commands.Cog):
             print(f"Error parsing date: {e}")
             return None
     
-    def _parse_combined(self, match, timezone_str: str) -> Optional[int]:
+    def _parse_combined(self, match, timezone_str: str, now: Optional[datetime] = None) -> Optional[int]:
         """Parse a combined date/time pattern and return Unix timestamp"""
         try:
-            tz = pytz.timezone(timezone_str)
-            now = datetime.now(tz)
+            tz = _get_tz(timezone_str)
+            if now is None:
+                now = datetime.now(tz)
             
             groups = match.groups()
             month_names = {
@@ -236,9 +296,9 @@ class TimestampCog(commands.Cog):
                     
                     year = now.year
                     try:
-                        dt = tz.localize(datetime(year, month, day, hour, minute))
+                        dt = datetime(year, month, day, hour, minute, tzinfo=tz)
                         if dt < now:
-                            dt = tz.localize(datetime(year + 1, month, day, hour, minute))
+                            dt = datetime(year + 1, month, day, hour, minute, tzinfo=tz)
                         return int(dt.timestamp())
                     except ValueError:
                         return None
@@ -261,9 +321,9 @@ class TimestampCog(commands.Cog):
                         
                         year = now.year
                         try:
-                            dt = tz.localize(datetime(year, month, day, hour, minute))
+                            dt = datetime(year, month, day, hour, minute, tzinfo=tz)
                             if dt < now:
-                                dt = tz.localize(datetime(year + 1, month, day, hour, minute))
+                                dt = datetime(year + 1, month, day, hour, minute, tzinfo=tz)
                             return int(dt.timestamp())
                         except ValueError:
                             return None
@@ -276,44 +336,47 @@ class TimestampCog(commands.Cog):
     
     def _detect_patterns(self, text: str) -> List[Tuple[str, int, str]]:
         """Detect time/date patterns in text and return list of (pattern_type, timestamp, matched_text)"""
-        patterns = self._compile_patterns()
-        results = []
+        # Most chat messages have no digits; skip the pattern scan for them
+        if not _ANY_DIGIT.search(text):
+            return []
         
-        # Check combined patterns first (most specific)
-        for pattern in patterns['combined']:
-            for match in pattern.finditer(text):
-                matched_text = match.group(0)
-                # We'll parse this later with timezone
-                results.append(('combined', None, matched_text))
-        
-        # Check date patterns
-        for pattern in patterns['date']:
-            for match in pattern.finditer(text):
-                matched_text = match.group(0)
-                # Skip if already matched by combined pattern
-                if not any(r[2] == matched_text for r in results):
-                    results.append(('date', None, matched_text))
-        
-        # Check time patterns
-        for pattern in patterns['time']:
-            for match in pattern.finditer(text):
-                matched_text = match.group(0)
-                # Skip if already matched by combined pattern
-                if not any(r[2] == matched_text for r in results):
-                    results.append(('time', None, matched_text))
+        # One scan over the text; a combined match consumes its date and time parts.
+        # Timestamps are parsed later with the user's timezone
+        return [(match.lastgroup, None, match.group(0)) for match in _ANY_PATTERN.finditer(text)]
+    
+    def _parse_cached(self, parser, match, timezone_str: str, now: datetime) -> Optional[int]:
+        """Run a _parse_* method, reusing the result for the same text earlier today"""
+        key = (match.re, match.groups(), timezone_str, now.toordinal())
+        timestamp = self._parse_cache.get(key)
+        # Within one local day a parse only changes once its result has passed
+        if timestamp is not None and timestamp >= now.timestamp():
+            self._parse_cache.move_to_end(key)
+            return timestamp
         
-        return results
+        # Every match in a message is resolved against the same current time
+        timestamp = parser(match, timezone_str, now)
+        if timestamp:
+            self._parse_cache[key] = timestamp
+            self._parse_cache.move_to_end(key)
+            if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        return timestamp
     
     async def _convert_patterns(self, text: str, timezone_str: str) -> List[Tuple[str, int, str]]:
         """Convert detected patterns to Discord timestamps"""
         patterns = self._compile_patterns()
         results = []
+        try:
+            now = datetime.now(_get_tz(timezone_str))
+        except (ZoneInfoNotFoundError, ValueError):
+            # An unusable stored timezone means nothing can be converted
+            return results
         
         # Check combined patterns first
         for pattern in patterns['combined']:
             for match in pattern.finditer(text):
                 matched_text = match.group(0)
-                timestamp = self._parse_combined(match, timezone_str)
+                timestamp = self._parse_cached(self._parse_combined, match, timezone_str, now)
                 if timestamp:
                     results.append(('combined', timestamp, matched_text))
                     # Mark this text as processed
@@ -323,7 +386,7 @@ class TimestampCog(commands.Cog):
         for pattern in patterns['date']:
             for match in pattern.finditer(text):
                 matched_text = match.group(0)
-                timestamp = self._parse_date(match, timezone_str)
+                timestamp = self._parse_cached(self._parse_date, match, timezone_str, now)
                 if timestamp:
                     results.append(('date', timestamp, matched_text))
                     # Mark this text as processed
@@ -333,7 +396,7 @@ class TimestampCog(commands.Cog):
         for pattern in patterns['time']:
             for match in pattern.finditer(text):
                 matched_text = match.group(0)
-                timestamp = self._parse_time(match, timezone_str)
+                timestamp = self._parse_cached(self._parse_time, match, timezone_str, now)
                 if timestamp:
                     results.append(('time', timestamp, matched_text))
         
@@ -342,32 +405,34 @@ class TimestampCog(commands.Cog):
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """Listen for messages in channels with 'general' in the name"""
+        # Bind the attributes used below once; this runs for every message the bot sees
+        author = message.author
+        
         # Ignore bot messages
-        if message.author.bot:
+        if author.bot:
             return
         
         # Check if channel name contains "general"
-        if not message.channel or not hasattr(message.channel, 'name'):
-            return
-        
-        channel_name = message.channel.name.lower()
-        if 'general' not in channel_name:
+        channel = message.channel
+        channel_name = getattr(channel, 'name', None) if channel else None
+        if not channel_name or 'general' not in channel_name.lower():
             return
         
         # Detect patterns in the message
-        detected = self._detect_patterns(message.content)
+        content = message.content
+        detected = self._detect_patterns(content)
         
         if not detected:
             return
         
         # Get user's timezone
-        timezone = await self.bot.db.get_user_timezone(message.author.id)
+        timezone = await self.bot.db.get_user_timezone(author.id)
         
         if not timezone:
             # User hasn't set timezone - prompt them (send as DM to avoid cluttering channel)
             try:
-                await message.author.send(
-                    f"I noticed you mentioned a time in {message.channel.mention}! Please set your timezone with `/set-timezone` so I can convert it for others."
+                await author.send(
+                    f"I noticed you mentioned a time in {channel.mention}! Please set your timezone with `/set-timezone` so I can convert it for others."
                 )
             except discord.Forbidden:
                 # User has DMs disabled, fall back to reply
@@ -378,44 +443,38 @@ class TimestampCog(commands.Cog):
             return
         
         # Convert patterns to Discord timestamps
-        converted = await self._convert_patterns(message.content, timezone)
+        converted = await self._convert_patterns(content, timezone)
         
         if not converted:
             return
         
         # Build reply message
-        reply_parts = []
-        for pattern_type, timestamp, matched_text in converted:
-            # Determine Discord timestamp format
-            if pattern_type == 'time':
-                format_char = 't'  # short time
-            elif pattern_type == 'date':
-                format_char = 'D'  # long date
-            else:  # combined
-                format_char = 'f'  # short date/time
-            
-            discord_timestamp = f"<t:{timestamp}:{format_char}>"
-            reply_parts.append(f"{message.author.mention}'s **{matched_text}** is {discord_timestamp} in your timezone")
+        mention = author.mention
+        reply_parts = [
+            f"{mention}'s **{matched_text}** is <t:{timestamp}:{_TIMESTAMP_FORMATS[pattern_type]}> in your timezone"
+            for pattern_type, timestamp, matched_text in converted
+        ]
         
-        if reply_parts:
-            await message.reply("\n".join(reply_parts), mention_author=False)
+        await message.reply("\n".join(reply_parts), mention_author=False)
     
     @app_commands.command(name="set-timezone", description="Set your timezone for timestamp conversion")
     @app_commands.describe(timezone="Your timezone (e.g., America/New_York, Europe/London, Asia/Tokyo)")
     async def set_timezone(self, interaction: discord.Interaction, timezone: str):
         """Set user's timezone"""
-        # Validate timezone using pytz
+        # Validate timezone against the IANA database; a dict lookup rejects
+        # unknown names without a failed zone file search each time, and
+        # accepts any case as pytz did, storing the canonical spelling
+        timezone = _canonical_timezone(timezone)
+        if timezone is None:
+            await interaction.response.send_message(_INVALID_TZ_MSG, ephemeral=True)
+            return
+        
         try:
-            tz = pytz.timezone(timezone)
+            tz = _get_tz(timezone)
             # Test that it's valid by getting current time
             datetime.now(tz)
-        except pytz.exceptions.UnknownTimeZoneError:
-            await interaction.response.send_message(
-                f"❌ Invalid timezone! Please use a valid timezone name like:\n"
-                f"`America/New_York`, `Europe/London`, `Asia/Tokyo`, `America/Los_Angeles`, etc.\n"
-                f"You can find a list at: https://en.wikipedia.org/wiki/List_of_tz_database_time_zones",
-                ephemeral=True
-            )
+        except (ZoneInfoNotFoundError, ValueError):
+            await interaction.response.send_message(_INVALID_TZ_MSG, ephemeral=True)
             return
         except Exception as e:
             await interaction.response.send_message(
@@ -445,19 +504,18 @@ class TimestampCog(commands.Cog):
         timezone = await self.bot.db.get_user_timezone(interaction.user.id)
         
         if not timezone:
-            embed = discord.Embed(
-                title="⏰ Timezone",
-                description="You haven't set your timezone yet.\n"
-                           "Use `/set-timezone` to configure it so I can convert times for you!",
-                color=discord.Color.orange()
-            )
+            embed = _NO_TZ_EMBED
         else:
-            tz = pytz.timezone(timezone)
+            try:
+                tz = _get_tz(timezone)
+            except (ZoneInfoNotFoundError, ValueError):
+                await interaction.response.send_message(_INVALID_TZ_MSG, ephemeral=True)
+                return
             current_time = datetime.now(tz).strftime("%Y-%m-%d %H:%M:%S %Z")
             
             embed = discord.Embed(
                 title="⏰ Your Timezone",
-                description=f"**{timezone}**\n"
+                description=f"**{_canonical_timezone(timezone) or timezone}**\n"
                            f"Current time: **{current_time}**",
                 color=discord.Color.blue()
             )
@@ -1,17 +1,199 @@
 import aiosqlite
 import asyncio
-from typing import Optional, List, Dict, Any
+from aiosqlitepool import SQLiteConnectionPool
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Tuple, Set
 from config import Config
 
+logger = logging.getLogger(__name__)
+
+# Seconds between background WAL checkpoints
+_WAL_MAINTENANCE_INTERVAL = 300
+
+# Days of posted facts/questions kept to avoid repeating them
+_RECENT_CONTENT_DAYS = 60
+# DATE('now', ?) modifier for the retention window
+_RECENT_CONTENT_CUTOFF = f'-{_RECENT_CONTENT_DAYS} days'
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+_STATEMENT_CACHE_SIZE = 256
+
+# Most recently used user timezones kept in memory
+_TZ_CACHE_SIZE = 4096
+
+# Mirrors the column defaults declared in the guild_config DDL below
+_GUILD_CONFIG_DEFAULTS: Dict[str, Any] = {
+    'guild_id': None,
+    'xp_per_message': 15,
+    'xp_cooldown': 60,
+    'level_up_channel': None,
+    'excluded_channels': None,
+    'starboard_channel': None,
+    'star_threshold': 3,
+    'star_emoji': '⭐',
+    'birthday_channel': None,
+    'birthday_role': None,
+    'birthday_time': '00:00',
+    'birthday_permanent_channel': None,
+    'birthday_permanent_message': None,
+    'admin_role': None,
+    'fact_channel': None,
+    'fact_time': '09:00',
+    'question_channel': None,
+    'question_time': '15:00',
+}
+
+# Small tables keyed by narrow composite primary keys, clustered on that key
+_WITHOUT_ROWID_TABLES = (
+    'starboard_messages',
+    'user_birthdays',
+    'geographic_polls',
+    'geographic_selections',
+    'recent_content',
+)
+
+# guild_config columns in a fixed order, so rows can be zipped without a cursor description
+_GUILD_CONFIG_SELECT = f"SELECT {', '.join(_GUILD_CONFIG_DEFAULTS)} FROM guild_config WHERE guild_id = ?"
+
+# Columns update_guild_config is allowed to write
+_GUILD_CONFIG_COLUMNS = frozenset(_GUILD_CONFIG_DEFAULTS) - {'guild_id'}
+
+# Levels up to this one are seeded into level_thresholds
+_MAX_SEEDED_LEVEL = 1000
+
+# XP needed for the level after the highest seeded one; totals from here up
+# are past the table and use the closed-form level_for_xp() instead
+_SEEDED_XP_LIMIT = 5 * _MAX_SEEDED_LEVEL ** 2 + 50 * _MAX_SEEDED_LEVEL + 100
+
+# Level lookup for an XP total, served by idx_level_thresholds_xp below the seeded cap
+_LEVEL_FOR_XP = f'''
+    CASE WHEN {{xp}} < {_SEEDED_XP_LIMIT}
+         THEN COALESCE((SELECT level FROM level_thresholds WHERE xp_required <= {{xp}}
+                        ORDER BY xp_required DESC LIMIT 1), 1)
+         ELSE level_for_xp({{xp}})
+    END
+'''
+
+# Adds XP and recomputes the level in the same statement
+_ADD_XP_SQL = f'''
+    INSERT INTO user_levels (user_id, guild_id, xp, level, last_message)
+    VALUES (?1, ?2, ?3, {_LEVEL_FOR_XP.format(xp='?3')}, CURRENT_TIMESTAMP)
+    ON CONFLICT(user_id, guild_id) DO UPDATE SET 
+        xp = xp + excluded.xp,
+        level = {_LEVEL_FOR_XP.format(xp='user_levels.xp + excluded.xp')},
+        last_message = CURRENT_TIMESTAMP
+'''
+
+# update_user_xp's variant, built once so the same SQL text is reused per call. The
+# pre-update level comes from the same lookup as the stored one, so the two always agree
+_ADD_XP_RETURNING_SQL = _ADD_XP_SQL + f" RETURNING xp, level, {_LEVEL_FOR_XP.format(xp='xp - ?3')}"
+
+
 class Database:
     """Database management class for the Discord bot"""
     
-    def __init__(self, db_file: str = None):
+    def __init__(self, db_file: str = None, durable: bool = True):
         self.db_file = db_file or Config.DATABASE_FILE
+        # Throwaway databases (tests) can skip fsync entirely
+        self.durable = durable
+        # Long-lived connections keep SQLite's page cache warm between calls.
+        # WAL allows many readers but one writer, so reads get a pool and writes
+        # share a single connection behind a lock.
+        self._readers = SQLiteConnectionPool(self._create_read_connection, pool_size=6)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        # In-memory mirrors of small hot tables; the database stays the source of truth
+        self._starboard: Optional[Dict[Tuple[int, int], Dict[str, Any]]] = None
+        self._posted_today: Set[Tuple[int, str]] = set()
+        self._posted_today_date: Optional[str] = None
+        # guild_config rows by guild_id; one entry per guild, dropped on update
+        self._cfg_cache: Dict[int, Dict[str, Any]] = {}
+        # Recently read user_timezones by user_id, least recently used first; users
+        # without a timezone aren't cached, so setting one elsewhere is seen at once
+        self._tz_cache: "OrderedDict[int, str]" = OrderedDict()
+        self._maintenance_task: Optional[asyncio.Task] = None
+    
+    async def _create_connection(self) -> aiosqlite.Connection:
+        """Open a connection with the per-connection PRAGMAs applied"""
+        # Long-lived connections reuse prepared statements for repeated SQL
+        db = await aiosqlite.connect(self.db_file, cached_statements=_STATEMENT_CACHE_SIZE)
+        # WAL lets readers proceed while a write is in flight; NORMAL only fsyncs at checkpoints
+        await db.execute('PRAGMA journal_mode=WAL')
+        await db.execute('PRAGMA synchronous=NORMAL' if self.durable else 'PRAGMA synchronous=OFF')
+        await db.execute('PRAGMA temp_store=MEMORY')
+        # 64 MB page cache (negative values are KiB)
+        await db.execute('PRAGMA cache_size=-65536')
+        await db.execute('PRAGMA busy_timeout=5000')
+        await db.execute('PRAGMA foreign_keys=ON')
+        # Read pages through a 256 MB memory map instead of read() copies
+        await db.execute('PRAGMA mmap_size=268435456')
+        # Checkpoint the WAL every 1000 pages so readers have fewer frames to scan
+        await db.execute('PRAGMA wal_autocheckpoint=1000')
+        # Closed-form level for XP totals beyond the seeded level_thresholds rows
+        await db.create_function('level_for_xp', 1, Database.calculate_level_from_xp, deterministic=True)
+        return db
+    
+    async def _create_read_connection(self) -> aiosqlite.Connection:
+        """Open a pooled read-only connection"""
+        db = await self._create_connection()
+        await db.execute('PRAGMA query_only=1')
+        return db
+    
+    @asynccontextmanager
+    async def _write_connection(self):
+        """Hold the single writer connection for the duration of a write"""
+        async with self._writer_lock:
+            if self._writer is None:
+                self._writer = await self._create_connection()
+            try:
+                yield self._writer
+            except BaseException:
+                # Don't leave a half-finished transaction for the next writer
+                await self._writer.rollback()
+                raise
+    
+    @asynccontextmanager
+    async def _write(self):
+        """Run a write transaction on the writer connection, committing on success"""
+        async with self._write_connection() as db:
+            # Take the write lock up front rather than upgrading a deferred transaction
+            await db.execute('BEGIN IMMEDIATE')
+            yield db
+            await db.commit()
+    
+    async def _wal_maintenance(self):
+        """Periodically truncate the WAL and refresh planner statistics"""
+        while True:
+            await asyncio.sleep(_WAL_MAINTENANCE_INTERVAL)
+            try:
+                async with self._write_connection() as db:
+                    await db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                    await db.execute('PRAGMA optimize')
+            except Exception as e:
+                logger.warning(f"WAL maintenance failed: {e}")
+    
+    async def close(self):
+        """Stop background tasks and close all connections"""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        await self._readers.close()
+        async with self._writer_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
     
     async def init_database(self):
         """Initialize the database with required tables"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write_connection() as db:
             # Leveling System Table
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS user_levels (
@@ -32,7 +214,7 @@ class Database:
                     guild_id INTEGER,
                     star_count INTEGER DEFAULT 0,
                     PRIMARY KEY (original_message_id, guild_id)
-                )
+                ) WITHOUT ROWID
             ''')
             
             # Birthday Table
@@ -43,7 +225,7 @@ class Database:
                     birth_month INTEGER,
                     birth_day INTEGER,
                     PRIMARY KEY (user_id, guild_id)
-                )
+                ) WITHOUT ROWID
             ''')
             
             # Guild Configuration Table
@@ -74,19 +256,6 @@ class Database:
                 )
             ''')
             
-            # Music Queue Table (in-memory alternative could be used)
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS music_queue (
-                    guild_id INTEGER,
-                    position INTEGER,
-                    title TEXT,
-                    url TEXT,
-                    duration INTEGER,
-                    requested_by INTEGER,
-                    PRIMARY KEY (guild_id, position)
-                )
-            ''')
-            
             # Recently Posted Content (to avoid repetition)
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS recent_content (
@@ -95,7 +264,7 @@ class Database:
                     content TEXT,
                     posted_date DATE DEFAULT CURRENT_DATE,
                     PRIMARY KEY (guild_id, content_type, content)
-                )
+                ) WITHOUT ROWID
             ''')
             
             # Geographic Polls Table
@@ -107,7 +276,7 @@ class Database:
                     title TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     PRIMARY KEY (message_id, guild_id)
-                )
+                ) WITHOUT ROWID
             ''')
             
             # Geographic Selections Table
@@ -119,7 +288,7 @@ class Database:
                     region TEXT,
                     selected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     PRIMARY KEY (user_id, message_id, guild_id)
-                )
+                ) WITHOUT ROWID
             ''')
             
             # User Timezones Table
@@ -130,218 +299,411 @@ class Database:
                 )
             ''')
             
+            # Level Thresholds Table (XP needed to reach each level)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS level_thresholds (
+                    level INTEGER PRIMARY KEY,
+                    xp_required INTEGER NOT NULL
+                )
+            ''')
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_level_thresholds_xp ON level_thresholds(xp_required, level)'
+            )
+            await self._seed_level_thresholds(db)
+            
             # Run migrations for existing databases
             await self._run_migrations(db)
             
+            # Indexes for the hot lookup paths (the primary keys lead with other columns)
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_levels_guild_xp ON user_levels(guild_id, xp DESC)')
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_bday_guild_month_day ON user_birthdays(guild_id, birth_month, birth_day, user_id)'
+            )
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_bday_month_day ON user_birthdays(birth_month, birth_day, guild_id, user_id)'
+            )
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_geo_sel_msg ON geographic_selections(message_id, guild_id, region)'
+            )
+            # Per-guild lookups are served by the (guild_id, content_type, content) primary key.
+            # has_posted_today and the retention prune filter on posted_date alone, so
+            # that index leads with it and covers the columns the daily reload reads;
+            # get_recent_content filters by type first and keeps its own index.
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_recent_date ON recent_content(posted_date, guild_id, content_type)'
+            )
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_recent_ct_date ON recent_content(content_type, posted_date)'
+            )
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_starboard_guild ON starboard_messages(guild_id, original_message_id)'
+            )
+            
+            await self._create_geographic_counts(db)
+            
+            # Gather planner statistics once; the maintenance task's PRAGMA optimize keeps them fresh
+            async with db.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'") as cursor:
+                has_stats = await cursor.fetchone() is not None
+            if not has_stats:
+                await db.execute('ANALYZE')
+            
             await db.commit()
+            
+            await self._load_starboard_cache(db)
+        
+        if self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._wal_maintenance())
+    
+    async def _load_starboard_cache(self, db):
+        """Populate the in-memory starboard mirror"""
+        async with db.execute(
+            'SELECT original_message_id, guild_id, starboard_message_id, star_count FROM starboard_messages'
+        ) as cursor:
+            rows = await cursor.fetchall()
+        self._starboard = {
+            (row[0], row[1]): {'starboard_message_id': row[2], 'star_count': row[3]}
+            for row in rows
+        }
+    
+    async def _create_geographic_counts(self, db):
+        """Create the per-region vote counters and the triggers that maintain them"""
+        # Created after migrations: rebuilding geographic_selections would drop its triggers
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS geographic_counts (
+                message_id INTEGER,
+                guild_id INTEGER,
+                region TEXT,
+                cnt INTEGER NOT NULL,
+                PRIMARY KEY (message_id, guild_id, region)
+            ) WITHOUT ROWID
+        ''')
+        await db.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_geo_sel_insert AFTER INSERT ON geographic_selections
+            BEGIN
+                INSERT INTO geographic_counts (message_id, guild_id, region, cnt)
+                VALUES (NEW.message_id, NEW.guild_id, NEW.region, 1)
+                ON CONFLICT(message_id, guild_id, region) DO UPDATE SET cnt = cnt + 1;
+            END
+        ''')
+        await db.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_geo_sel_delete AFTER DELETE ON geographic_selections
+            BEGIN
+                UPDATE geographic_counts SET cnt = cnt - 1
+                WHERE message_id = OLD.message_id AND guild_id = OLD.guild_id AND region = OLD.region;
+                DELETE FROM geographic_counts
+                WHERE message_id = OLD.message_id AND guild_id = OLD.guild_id AND region = OLD.region AND cnt <= 0;
+            END
+        ''')
+        await db.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_geo_sel_update
+            AFTER UPDATE OF message_id, guild_id, region ON geographic_selections
+            BEGIN
+                UPDATE geographic_counts SET cnt = cnt - 1
+                WHERE message_id = OLD.message_id AND guild_id = OLD.guild_id AND region = OLD.region;
+                DELETE FROM geographic_counts
+                WHERE message_id = OLD.message_id AND guild_id = OLD.guild_id AND region = OLD.region AND cnt <= 0;
+                INSERT INTO geographic_counts (message_id, guild_id, region, cnt)
+                VALUES (NEW.message_id, NEW.guild_id, NEW.region, 1)
+                ON CONFLICT(message_id, guild_id, region) DO UPDATE SET cnt = cnt + 1;
+            END
+        ''')
+        
+        # Backfill selections recorded before the counters existed
+        async with db.execute('SELECT 1 FROM geographic_counts LIMIT 1') as cursor:
+            has_counts = await cursor.fetchone() is not None
+        if not has_counts:
+            await db.execute('''
+                INSERT INTO geographic_counts (message_id, guild_id, region, cnt)
+                SELECT message_id, guild_id, region, COUNT(*)
+                FROM geographic_selections
+                GROUP BY message_id, guild_id, region
+            ''')
+    
+    async def _seed_level_thresholds(self, db):
+        """Fill level_thresholds from calculate_xp_for_level if it is incomplete"""
+        async with db.execute('SELECT COUNT(*) FROM level_thresholds') as cursor:
+            row = await cursor.fetchone()
+        if row[0] >= _MAX_SEEDED_LEVEL:
+            return
+        await db.executemany(
+            'INSERT OR REPLACE INTO level_thresholds (level, xp_required) VALUES (?, ?)',
+            [(level, self.calculate_xp_for_level(level)) for level in range(1, _MAX_SEEDED_LEVEL + 1)]
+        )
     
     async def _run_migrations(self, db):
         """Run database migrations for existing databases"""
-        # Check if birthday permanent columns exist
-        try:
-            await db.execute('SELECT birthday_permanent_channel FROM guild_config LIMIT 1')
-        except Exception:
-            # Columns don't exist, add them
+        # Read the column list once instead of probing with failing SELECTs
+        async with db.execute('PRAGMA table_info(guild_config)') as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        # Add birthday permanent post columns if missing
+        if 'birthday_permanent_channel' not in columns:
             print("Running migration: Adding birthday permanent post columns...")
             await db.execute('ALTER TABLE guild_config ADD COLUMN birthday_permanent_channel INTEGER')
             await db.execute('ALTER TABLE guild_config ADD COLUMN birthday_permanent_message INTEGER')
             print("Migration completed: Birthday permanent post columns added")
         # Add admin_role column if missing
-        try:
-            await db.execute('SELECT admin_role FROM guild_config LIMIT 1')
-        except Exception:
+        if 'admin_role' not in columns:
             print("Running migration: Adding admin_role column...")
             await db.execute('ALTER TABLE guild_config ADD COLUMN admin_role INTEGER')
             print("Migration completed: admin_role column added")
+        # Music queues live in memory (GuildMusicState); drop the unused table
+        await db.execute('DROP TABLE IF EXISTS music_queue')
+        # Rebuild tables created before they were declared WITHOUT ROWID
+        for table in _WITHOUT_ROWID_TABLES:
+            async with db.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None or 'WITHOUT ROWID' in row[0].upper():
+                continue
+            print(f"Running migration: Converting {table} to WITHOUT ROWID...")
+            await db.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+            await db.execute(f'{row[0]} WITHOUT ROWID')
+            # Rows with NULL key columns could never be looked up; skip them
+            await db.execute(f'INSERT OR IGNORE INTO {table} SELECT * FROM {table}_old')
+            await db.execute(f'DROP TABLE {table}_old')
+            print(f"Migration completed: {table} converted")
     
     # Leveling System Methods
     async def get_user_level_data(self, user_id: int, guild_id: int) -> Optional[Dict[str, Any]]:
         """Get user's level data"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
                 'SELECT xp, level, last_message FROM user_levels WHERE user_id = ? AND guild_id = ?',
                 (user_id, guild_id)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {'xp': row[0], 'level': row[1], 'last_message': row[2]}
+            )
+            if not rows:
                 return None
+            row = rows[0]
+            return {'xp': row[0], 'level': row[1], 'last_message': row[2]}
     
-    async def update_user_xp(self, user_id: int, guild_id: int, xp_to_add: int):
-        """Update user's XP and level"""
-        async with aiosqlite.connect(self.db_file) as db:
-            # Insert or update user data
-            await db.execute('''
-                INSERT INTO user_levels (user_id, guild_id, xp, level, last_message)
-                VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP)
-                ON CONFLICT(user_id, guild_id) DO UPDATE SET 
-                    xp = xp + ?,
-                    last_message = CURRENT_TIMESTAMP
-            ''', (user_id, guild_id, xp_to_add, xp_to_add))
-            
-            # Get updated XP and calculate new level
-            async with db.execute(
-                'SELECT xp FROM user_levels WHERE user_id = ? AND guild_id = ?',
-                (user_id, guild_id)
-            ) as cursor:
-                result = await cursor.fetchone()
-                if result:
-                    current_xp = result[0]
-                    new_level = self.calculate_level_from_xp(current_xp)
-                    
-                    await db.execute(
-                        'UPDATE user_levels SET level = ? WHERE user_id = ? AND guild_id = ?',
-                        (new_level, user_id, guild_id)
-                    )
-            
-            await db.commit()
+    async def update_user_xp(self, user_id: int, guild_id: int, xp_to_add: int) -> Dict[str, Any]:
+        """Update user's XP and level, returning the new values and whether the user leveled up"""
+        async with self._write() as db:
+            rows = await db.execute_fetchall(_ADD_XP_RETURNING_SQL, (user_id, guild_id, xp_to_add))
+        new_xp, new_level, old_level = rows[0]
+        return {'xp': new_xp, 'level': new_level, 'old_level': old_level, 'leveled_up': new_level > old_level}
+    
+    async def bulk_add_xp(self, rows: List[Tuple[int, int, int]]):
+        """Add XP for many (user_id, guild_id, xp_to_add) rows in one transaction"""
+        if not rows:
+            return
+        
+        async with self._write() as db:
+            await db.executemany(_ADD_XP_SQL, rows)
     
     async def get_leaderboard(self, guild_id: int, limit: int = 10) -> List[Dict[str, Any]]:
         """Get server leaderboard"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute('''
-                SELECT user_id, xp, level,
-                       ROW_NUMBER() OVER (ORDER BY xp DESC) as rank
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall('''
+                SELECT user_id, xp, level
                 FROM user_levels 
                 WHERE guild_id = ? 
                 ORDER BY xp DESC 
                 LIMIT ?
-            ''', (guild_id, limit)) as cursor:
-                rows = await cursor.fetchall()
-                return [
-                    {'user_id': row[0], 'xp': row[1], 'level': row[2], 'rank': row[3]}
-                    for row in rows
-                ]
+            ''', (guild_id, limit))
+            # Rows arrive ordered by XP, so rank is just the position
+            return [
+                {'user_id': row[0], 'xp': row[1], 'level': row[2], 'rank': rank}
+                for rank, row in enumerate(rows, 1)
+            ]
     
     async def set_user_level(self, user_id: int, guild_id: int, level: int):
         """Manually set user's level"""
         xp_required = self.calculate_xp_for_level(level)
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute('''
                 INSERT INTO user_levels (user_id, guild_id, xp, level)
                 VALUES (?, ?, ?, ?)
                 ON CONFLICT(user_id, guild_id) DO UPDATE SET 
-                    xp = ?, level = ?
-            ''', (user_id, guild_id, xp_required, level, xp_required, level))
-            await db.commit()
+                    xp = excluded.xp, level = excluded.level
+            ''', (user_id, guild_id, xp_required, level))
+    
+    async def reset_guild_levels(self, guild_id: int):
+        """Remove every user's XP in a guild"""
+        async with self._write() as db:
+            await db.execute('DELETE FROM user_levels WHERE guild_id = ?', (guild_id,))
     
     # Starboard Methods
     async def add_starboard_message(self, original_id: int, starboard_id: int, guild_id: int, star_count: int):
         """Add a message to starboard tracking"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute('''
                 INSERT INTO starboard_messages (original_message_id, starboard_message_id, guild_id, star_count)
                 VALUES (?, ?, ?, ?)
             ''', (original_id, starboard_id, guild_id, star_count))
-            await db.commit()
+        if self._starboard is not None:
+            self._starboard[(original_id, guild_id)] = {'starboard_message_id': starboard_id, 'star_count': star_count}
     
     async def get_starboard_message(self, original_id: int, guild_id: int) -> Optional[Dict[str, Any]]:
         """Get starboard message data"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
+        if self._starboard is not None:
+            entry = self._starboard.get((original_id, guild_id))
+            return dict(entry) if entry else None
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
                 'SELECT starboard_message_id, star_count FROM starboard_messages WHERE original_message_id = ? AND guild_id = ?',
                 (original_id, guild_id)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {'starboard_message_id': row[0], 'star_count': row[1]}
+            )
+            if not rows:
                 return None
+            row = rows[0]
+            return {'starboard_message_id': row[0], 'star_count': row[1]}
     
     async def update_starboard_count(self, original_id: int, guild_id: int, star_count: int):
         """Update star count for a starboard message"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute(
                 'UPDATE starboard_messages SET star_count = ? WHERE original_message_id = ? AND guild_id = ?',
                 (star_count, original_id, guild_id)
             )
-            await db.commit()
+        if self._starboard is not None and (original_id, guild_id) in self._starboard:
+            self._starboard[(original_id, guild_id)]['star_count'] = star_count
     
     async def remove_starboard_message(self, original_id: int, guild_id: int):
         """Remove a message from starboard tracking"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute(
                 'DELETE FROM starboard_messages WHERE original_message_id = ? AND guild_id = ?',
                 (original_id, guild_id)
             )
-            await db.commit()
+        if self._starboard is not None:
+            self._starboard.pop((original_id, guild_id), None)
     
     # Birthday Methods
     async def set_user_birthday(self, user_id: int, guild_id: int, month: int, day: int):
         """Set user's birthday"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute('''
                 INSERT INTO user_birthdays (user_id, guild_id, birth_month, birth_day)
                 VALUES (?, ?, ?, ?)
                 ON CONFLICT(user_id, guild_id) DO UPDATE SET 
-                    birth_month = ?, birth_day = ?
-            ''', (user_id, guild_id, month, day, month, day))
-            await db.commit()
+                    birth_month = excluded.birth_month, birth_day = excluded.birth_day
+            ''', (user_id, guild_id, month, day))
+    
+    async def bulk_set_birthdays(self, rows: List[Tuple[int, int, int, int]]):
+        """Set many (user_id, guild_id, month, day) birthdays in one transaction"""
+        if not rows:
+            return
+        
+        async with self._write() as db:
+            await db.executemany('''
+                INSERT INTO user_birthdays (user_id, guild_id, birth_month, birth_day)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, guild_id) DO UPDATE SET 
+                    birth_month = excluded.birth_month, birth_day = excluded.birth_day
+            ''', rows)
+    
+    async def get_user_birthday(self, user_id: int, guild_id: int) -> Optional[Tuple[int, int]]:
+        """Get a user's (month, day) birthday"""
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
+                'SELECT birth_month, birth_day FROM user_birthdays WHERE user_id = ? AND guild_id = ?',
+                (user_id, guild_id)
+            )
+            return tuple(rows[0]) if rows else None
+    
+    async def remove_user_birthday(self, user_id: int, guild_id: int):
+        """Remove a user's birthday"""
+        async with self._write() as db:
+            await db.execute(
+                'DELETE FROM user_birthdays WHERE user_id = ? AND guild_id = ?',
+                (user_id, guild_id)
+            )
+    
+    async def get_guild_birthdays(self, guild_id: int) -> List[Tuple[int, int, int]]:
+        """Get every (user_id, month, day) birthday in a guild, in calendar order"""
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
+                'SELECT user_id, birth_month, birth_day FROM user_birthdays WHERE guild_id = ? ORDER BY birth_month, birth_day',
+                (guild_id,)
+            )
+            return [tuple(row) for row in rows]
     
     async def get_birthdays_for_date(self, guild_id: int, month: int, day: int) -> List[int]:
         """Get users with birthdays on specific date"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
                 'SELECT user_id FROM user_birthdays WHERE guild_id = ? AND birth_month = ? AND birth_day = ?',
                 (guild_id, month, day)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [row[0] for row in rows]
+            )
+            return [row[0] for row in rows]
+    
+    async def get_all_birthdays_for_date(self, month: int, day: int) -> Dict[int, List[int]]:
+        """Get users with birthdays on specific date for every guild, keyed by guild_id"""
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
+                'SELECT guild_id, user_id FROM user_birthdays WHERE birth_month = ? AND birth_day = ?',
+                (month, day)
+            )
+        
+        birthdays: Dict[int, List[int]] = {}
+        for guild_id, user_id in rows:
+            birthdays.setdefault(guild_id, []).append(user_id)
+        return birthdays
     
     async def get_birthdays_for_month(self, guild_id: int, month: int) -> List[Dict[str, Any]]:
         """Get all birthdays for a specific month"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
                 'SELECT user_id, birth_day FROM user_birthdays WHERE guild_id = ? AND birth_month = ? ORDER BY birth_day',
                 (guild_id, month)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [{'user_id': row[0], 'day': row[1]} for row in rows]
+            )
+            return [{'user_id': row[0], 'day': row[1]} for row in rows]
     
     # Guild Configuration Methods
     async def get_guild_config(self, guild_id: int) -> Dict[str, Any]:
         """Get guild configuration"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
-                'SELECT * FROM guild_config WHERE guild_id = ?',
-                (guild_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    columns = [description[0] for description in cursor.description]
-                    return dict(zip(columns, row))
-                else:
-                    # Create default config
-                    await self.create_default_guild_config(guild_id)
-                    return await self.get_guild_config(guild_id)
+        cached = self._cfg_cache.get(guild_id)
+        if cached is not None:
+            return dict(cached)
+        
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(_GUILD_CONFIG_SELECT, (guild_id,))
+        if rows:
+            self._cfg_cache[guild_id] = dict(zip(_GUILD_CONFIG_DEFAULTS, rows[0]))
+            return dict(self._cfg_cache[guild_id])
+        
+        # Create default config and return the defaults without re-reading the row
+        await self.create_default_guild_config(guild_id)
+        return {**_GUILD_CONFIG_DEFAULTS, 'guild_id': guild_id}
     
     async def create_default_guild_config(self, guild_id: int):
         """Create default configuration for a guild"""
-        async with aiosqlite.connect(self.db_file) as db:
-            await db.execute(
+        async with self._write() as db:
+            cursor = await db.execute(
                 'INSERT OR IGNORE INTO guild_config (guild_id) VALUES (?)',
                 (guild_id,)
             )
-            await db.commit()
+        # A fresh row holds exactly the schema defaults, so cache them without a re-read
+        if cursor.rowcount == 1:
+            self._cfg_cache[guild_id] = {**_GUILD_CONFIG_DEFAULTS, 'guild_id': guild_id}
     
     async def update_guild_config(self, guild_id: int, **kwargs):
         """Update guild configuration"""
         if not kwargs:
             return
         
-        set_clause = ', '.join([f'{key} = ?' for key in kwargs.keys()])
-        values = list(kwargs.values()) + [guild_id]
+        unknown = set(kwargs) - _GUILD_CONFIG_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown guild config columns: {', '.join(sorted(unknown))}")
         
-        async with aiosqlite.connect(self.db_file) as db:
+        # Sorted keys give identical SQL for identical kwarg sets, so the statement cache hits
+        keys = sorted(kwargs)
+        set_clause = ', '.join([f'{key} = ?' for key in keys])
+        values = [kwargs[key] for key in keys] + [guild_id]
+        
+        async with self._write() as db:
             await db.execute(
                 f'UPDATE guild_config SET {set_clause} WHERE guild_id = ?',
                 values
             )
-            await db.commit()
+        self._cfg_cache.pop(guild_id, None)
     
     # Cleanup Methods
     async def cleanup_user_data(self, user_id: int, guild_id: int):
         """Remove all user data when they leave the server"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             # Remove from leveling
             await db.execute(
                 'DELETE FROM user_levels WHERE user_id = ? AND guild_id = ?',
@@ -353,53 +715,135 @@ class Database:
                 'DELETE FROM user_birthdays WHERE user_id = ? AND guild_id = ?',
                 (user_id, guild_id)
             )
-            
-            await db.commit()
+    
+    async def cleanup_users_data(self, user_ids: List[int], guild_id: int):
+        """Remove data for many users at once (e.g. mass departures)"""
+        if not user_ids:
+            return
+        
+        rows = [(user_id, guild_id) for user_id in user_ids]
+        async with self._write() as db:
+            await db.executemany(
+                'DELETE FROM user_levels WHERE user_id = ? AND guild_id = ?',
+                rows
+            )
+            await db.executemany(
+                'DELETE FROM user_birthdays WHERE user_id = ? AND guild_id = ?',
+                rows
+            )
+    
+    # Recent Content Methods
+    async def has_posted_today(self, guild_id: int, content_type: str) -> bool:
+        """Check if content of a certain type has been posted today for a guild"""
+        today = datetime.now(timezone.utc).date().isoformat()
+        if self._posted_today_date != today:
+            # Date rolled over (or first call); reload today's rows from the database
+            async with self._readers.connection() as db:
+                rows = await db.execute_fetchall(
+                    "SELECT guild_id, content_type FROM recent_content WHERE posted_date = ?",
+                    (today,)
+                )
+            self._posted_today = {(row[0], row[1]) for row in rows}
+            self._posted_today_date = today
+        return (guild_id, content_type) in self._posted_today
+    
+    async def add_recent_content(self, guild_id: int, content_type: str, content: str):
+        """Record posted content to avoid repetition, pruning entries past the retention window"""
+        today = datetime.now(timezone.utc).date().isoformat()
+        async with self._write() as db:
+            await db.execute(
+                "DELETE FROM recent_content WHERE posted_date < DATE('now', ?)",
+                (_RECENT_CONTENT_CUTOFF,)
+            )
+            # REPLACE rather than IGNORE so a repeat post moves to today's date
+            await db.execute('''
+                INSERT OR REPLACE INTO recent_content (guild_id, content_type, content, posted_date)
+                VALUES (?, ?, ?, ?)
+            ''', (guild_id, content_type, content, today))
+        if self._posted_today_date == today:
+            self._posted_today.add((guild_id, content_type))
+    
+    async def get_recent_content(self, content_type: str, limit: int = 50) -> List[str]:
+        """Get recently posted content of a type across all guilds, newest first"""
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall('''
+                SELECT content FROM recent_content
+                WHERE content_type = ? AND posted_date > DATE('now', ?)
+                ORDER BY posted_date DESC
+                LIMIT ?
+            ''', (content_type, _RECENT_CONTENT_CUTOFF, limit))
+            return [row[0] for row in rows]
     
     # Geographic Poll Methods
     async def add_geographic_poll(self, message_id: int, guild_id: int, title: str, channel_id: int = None):
         """Add a geographic poll to tracking"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute('''
                 INSERT INTO geographic_polls (message_id, guild_id, channel_id, title)
                 VALUES (?, ?, ?, ?)
             ''', (message_id, guild_id, channel_id, title))
-            await db.commit()
     
     async def is_geographic_poll(self, message_id: int, guild_id: int) -> bool:
         """Check if a message is a geographic poll"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
                 'SELECT 1 FROM geographic_polls WHERE message_id = ? AND guild_id = ?',
                 (message_id, guild_id)
-            ) as cursor:
-                row = await cursor.fetchone()
-                return row is not None
+            )
+            return bool(rows)
     
     async def get_geographic_poll(self, message_id: int, guild_id: int) -> Optional[Dict[str, Any]]:
         """Get geographic poll data"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
                 'SELECT title, channel_id, created_at FROM geographic_polls WHERE message_id = ? AND guild_id = ?',
                 (message_id, guild_id)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {'title': row[0], 'channel_id': row[1], 'created_at': row[2]}
+            )
+            if not rows:
                 return None
+            row = rows[0]
+            return {'title': row[0], 'channel_id': row[1], 'created_at': row[2]}
     
     async def add_geographic_selection(self, user_id: int, message_id: int, guild_id: int, region: str):
         """Add a user's geographic selection"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
+            # An upsert rather than INSERT OR REPLACE: REPLACE's implicit delete
+            # does not fire the delete trigger that keeps geographic_counts in step
             await db.execute('''
-                INSERT OR REPLACE INTO geographic_selections (user_id, message_id, guild_id, region)
+                INSERT INTO geographic_selections (user_id, message_id, guild_id, region)
                 VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, message_id, guild_id) DO UPDATE SET
+                    region = excluded.region, selected_at = CURRENT_TIMESTAMP
+            ''', (user_id, message_id, guild_id, region))
+    
+    async def bulk_add_geographic_selections(self, rows: List[Tuple[int, int, int, str]]):
+        """Add many (user_id, message_id, guild_id, region) selections in one transaction"""
+        if not rows:
+            return
+        
+        async with self._write() as db:
+            await db.executemany('''
+                INSERT INTO geographic_selections (user_id, message_id, guild_id, region)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, message_id, guild_id) DO UPDATE SET
+                    region = excluded.region, selected_at = CURRENT_TIMESTAMP
+            ''', rows)
+    
+    async def replace_geographic_selection(self, user_id: int, message_id: int, guild_id: int, region: str):
+        """Replace a user's selection on a poll with a new region"""
+        # The primary key allows one selection per user per poll, so an upsert
+        # replaces any previous region in a single statement
+        async with self._write() as db:
+            await db.execute('''
+                INSERT INTO geographic_selections (user_id, message_id, guild_id, region)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, message_id, guild_id) DO UPDATE SET
+                    region = excluded.region, selected_at = CURRENT_TIMESTAMP
             ''', (user_id, message_id, guild_id, region))
-            await db.commit()
     
     async def remove_geographic_selection(self, user_id: int, message_id: int, guild_id: int, region: str = None):
         """Remove a user's geographic selection"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             if region:
                 await db.execute(
                     'DELETE FROM geographic_selections WHERE user_id = ? AND message_id = ? AND guild_id = ? AND region = ?',
@@ -410,81 +854,91 @@ class Database:
                     'DELETE FROM geographic_selections WHERE user_id = ? AND message_id = ? AND guild_id = ?',
                     (user_id, message_id, guild_id)
                 )
-            await db.commit()
     
     async def remove_user_geographic_selection(self, user_id: int, message_id: int, guild_id: int):
         """Remove all geographic selections for a user on a specific poll"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute(
                 'DELETE FROM geographic_selections WHERE user_id = ? AND message_id = ? AND guild_id = ?',
                 (user_id, message_id, guild_id)
             )
-            await db.commit()
     
     async def get_geographic_results(self, message_id: int, guild_id: int) -> Dict[str, int]:
         """Get geographic poll results"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
-                'SELECT region, COUNT(*) FROM geographic_selections WHERE message_id = ? AND guild_id = ? GROUP BY region',
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
+                'SELECT region, cnt FROM geographic_counts WHERE message_id = ? AND guild_id = ?',
                 (message_id, guild_id)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return {row[0]: row[1] for row in rows}
+            )
+            return {row[0]: row[1] for row in rows}
     
     async def get_user_geographic_selections(self, user_id: int, guild_id: int) -> List[Dict[str, Any]]:
         """Get all geographic selections for a user in a guild"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute('''
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall('''
                 SELECT gs.region, gs.message_id, gp.title, gs.selected_at
                 FROM geographic_selections gs
                 JOIN geographic_polls gp ON gs.message_id = gp.message_id AND gs.guild_id = gp.guild_id
                 WHERE gs.user_id = ? AND gs.guild_id = ?
                 ORDER BY gs.selected_at DESC
-            ''', (user_id, guild_id)) as cursor:
-                rows = await cursor.fetchall()
-                return [
-                    {
-                        'region': row[0],
-                        'message_id': row[1],
-                        'poll_title': row[2],
-                        'selected_at': row[3]
-                    }
-                    for row in rows
-                ]
+            ''', (user_id, guild_id))
+            return [
+                {
+                    'region': row[0],
+                    'message_id': row[1],
+                    'poll_title': row[2],
+                    'selected_at': row[3]
+                }
+                for row in rows
+            ]
     
     # Timezone Methods
     async def get_user_timezone(self, user_id: int) -> Optional[str]:
         """Get user's timezone"""
-        async with aiosqlite.connect(self.db_file) as db:
-            async with db.execute(
+        timezone = self._tz_cache.get(user_id)
+        if timezone is not None:
+            self._tz_cache.move_to_end(user_id)
+            return timezone
+        
+        async with self._readers.connection() as db:
+            rows = await db.execute_fetchall(
                 'SELECT timezone FROM user_timezones WHERE user_id = ?',
                 (user_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return row[0]
-                return None
+            )
+        if not rows:
+            return None
+        self._cache_timezone(user_id, rows[0][0])
+        return rows[0][0]
     
     async def set_user_timezone(self, user_id: int, timezone: str):
         """Set user's timezone"""
-        async with aiosqlite.connect(self.db_file) as db:
+        async with self._write() as db:
             await db.execute('''
                 INSERT INTO user_timezones (user_id, timezone)
                 VALUES (?, ?)
-                ON CONFLICT(user_id) DO UPDATE SET timezone = ?
-            ''', (user_id, timezone, timezone))
-            await db.commit()
+                ON CONFLICT(user_id) DO UPDATE SET timezone = excluded.timezone
+            ''', (user_id, timezone))
+        self._cache_timezone(user_id, timezone)
+    
+    def _cache_timezone(self, user_id: int, timezone: str):
+        """Remember a user's timezone, evicting the least recently used entry when full"""
+        self._tz_cache[user_id] = timezone
+        self._tz_cache.move_to_end(user_id)
+        if len(self._tz_cache) > _TZ_CACHE_SIZE:
+            self._tz_cache.popitem(last=False)
     
     # Utility Methods
     @staticmethod
     def calculate_level_from_xp(xp: int) -> int:
         """Calculate level from XP using the formula: 5 * (lvl ^ 2) + 50 * lvl + 100"""
-        level = 1
-        while True:
-            xp_required = 5 * (level ** 2) + 50 * level + 100
-            if xp < xp_required:
-                return level
+        # The level is the smallest lvl with xp < 5*lvl^2 + 50*lvl + 100. Solving the
+        # quadratic gives lvl > (sqrt(20*xp + 500) - 50) / 10; isqrt keeps it exact.
+        if xp < 100:
+            return 1
+        level = max(1, (math.isqrt(20 * xp + 500) - 50) // 10)
+        while 5 * level * level + 50 * level + 100 <= xp:
             level += 1
+        return level
     
     @staticmethod
     def calculate_xp_for_level(level: int) -> int:
@@ -7,10 +7,17 @@ while maintaining the directory structure.
 
 import os
 import sys
+import mmap
+import shlex
 import stat
+import tarfile
+import time
+import queue
+import threading
 import paramiko
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set, Tuple
 import logging
 from dotenv import load_dotenv
 
@@ -24,6 +31,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Files at least this large are memory-mapped instead of read into a bytes object
+MMAP_THRESHOLD = 64 * 1024
+
+# Files smaller than this are sent together as one tar stream rather than one SFTP put each
+TAR_THRESHOLD = 64 * 1024
+
+# Permissions for uploaded scripts (rwxr-xr-x)
+SCRIPT_MODE = (stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR |
+               stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
+
+# Paths per batched chmod command
+CHMOD_BATCH_SIZE = 100
+
 class SFTPDeployer:
     """Handles SFTP deployment of files to remote server"""
     
@@ -35,6 +55,10 @@ class SFTPDeployer:
         self.password = os.getenv('SFTP_PASSWORD', '')  # Leave empty to use key auth
         self.private_key_path = os.getenv('SFTP_KEY_PATH', '~/.ssh/id_rsa')
         self.remote_path = os.getenv('SFTP_REMOTE_PATH', '/path/to/your/bot')
+        # Stream small files through a remote `tar -x` instead of individual puts
+        self.tar_small_files = os.getenv('SFTP_TAR_SMALL_FILES', '1') != '0'
+        # Number of SFTP channels uploading in parallel over the one SSH connection
+        self.workers = max(1, int(os.getenv('SFTP_WORKERS', '4')))
         
         # Local configuration
         self.local_path = Path.cwd()
@@ -59,34 +83,50 @@ class SFTPDeployer:
             '.idea'
         }
         
+        self._compile_exclude_patterns()
+        
         # SFTP connection
         self.ssh_client = None
         self.sftp_client = None
+        self.sftp_clients: List[paramiko.SFTPClient] = []
+        
+        # Workers share the remote directory tree, so creation is serialized
+        self._dir_lock = threading.Lock()
+        # Remote directories known to exist, so they are never stat'ed twice
+        self._known_remote_dirs: Set[str] = set()
+        # The subset created by this connection; their children need no stat at all
+        self._created_remote_dirs: Set[str] = set()
+        # Remote file attributes by path, used to skip unchanged files
+        self._remote_index: Dict[str, paramiko.SFTPAttributes] = {}
+        # Whether _remote_index reflects this connection; uploads keep it current,
+        # so --watch lists the remote tree once rather than on every poll
+        self._remote_index_fresh = False
+        # Uploaded scripts still waiting to be made executable
+        self._pending_chmod: List[str] = []
+        # Upload every file even if the remote copy looks unchanged
+        self.force = False
+    
+    def _compile_exclude_patterns(self):
+        """Split the exclusion patterns by kind so each check is a set lookup or str method call"""
+        self._exclude_exact = {p for p in self.exclude_patterns if not p.startswith('*') and not p.endswith('*')}
+        self._exclude_contains = tuple(
+            p[1:-1] for p in self.exclude_patterns if p.startswith('*') and p.endswith('*')
+        )
+        self._exclude_suffixes = tuple(p[1:] for p in self.exclude_patterns if p.startswith('*') and not p.endswith('*'))
+        self._exclude_prefixes = tuple(p[:-1] for p in self.exclude_patterns if p.endswith('*') and not p.startswith('*'))
+    
+    def _should_exclude_name(self, name: str) -> bool:
+        """Check a single file or directory name against the compiled exclusion patterns"""
+        return (
+            name in self._exclude_exact
+            or name.endswith(self._exclude_suffixes)
+            or name.startswith(self._exclude_prefixes)
+            or any(part in name for part in self._exclude_contains)
+        )
     
     def should_exclude(self, path: Path) -> bool:
         """Check if a file or directory should be excluded from upload"""
-        path_str = str(path)
-        name = path.name
-        
-        for pattern in self.exclude_patterns:
-            if pattern.startswith('*') and pattern.endswith('*'):
-                # Contains pattern
-                if pattern[1:-1] in name:
-                    return True
-            elif pattern.startswith('*'):
-                # Ends with pattern
-                if name.endswith(pattern[1:]):
-                    return True
-            elif pattern.endswith('*'):
-                # Starts with pattern
-                if name.startswith(pattern[:-1]):
-                    return True
-            else:
-                # Exact match
-                if name == pattern or path_str.endswith(f'/{pattern}') or path_str.endswith(f'\\{pattern}'):
-                    return True
-        
-        return False
+        return self._should_exclude_name(path.name)
     
     def connect(self) -> bool:
         """Establish SFTP connection"""
@@ -97,14 +137,16 @@ class SFTPDeployer:
             self.ssh_client = paramiko.SSHClient()
             self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             
-            # Connect with password or key authentication
+            # Connect with password or key authentication; zlib on the transport
+            # shrinks the mostly-text payload (.py/.md/.txt) several times over
             if self.password:
                 logger.info("Using password authentication")
                 self.ssh_client.connect(
                     hostname=self.hostname,
                     port=self.port,
                     username=self.username,
-                    password=self.password
+                    password=self.password,
+                    compress=True
                 )
             else:
                 logger.info("Using key authentication")
@@ -120,15 +162,32 @@ class SFTPDeployer:
                         hostname=self.hostname,
                         port=self.port,
                         username=self.username,
-                        pkey=private_key
+                        pkey=private_key,
+                        compress=True
                     )
                 else:
                     logger.error(f"Private key file not found: {private_key_path}")
                     return False
             
+            # Keep idle sessions (e.g. in --watch mode) from being dropped
+            self.ssh_client.get_transport().set_keepalive(30)
+            
             # Create SFTP client
             self.sftp_client = self.ssh_client.open_sftp()
-            logger.info("SFTP connection established successfully")
+            self._known_remote_dirs.clear()
+            self._created_remote_dirs.clear()
+            self._remote_index_fresh = False
+            self.sftp_clients = [self.sftp_client]
+            
+            # Extra channels for parallel uploads; the server's MaxSessions may cap these
+            for _ in range(self.workers - 1):
+                try:
+                    self.sftp_clients.append(self.ssh_client.open_sftp())
+                except Exception as e:
+                    logger.warning(f"Could only open {len(self.sftp_clients)} SFTP channels: {str(e)}")
+                    break
+            
+            logger.info(f"SFTP connection established successfully ({len(self.sftp_clients)} channels)")
             return True
             
         except Exception as e:
@@ -137,44 +196,140 @@ class SFTPDeployer:
     
     def disconnect(self):
         """Close SFTP connection"""
-        if self.sftp_client:
-            self.sftp_client.close()
+        for sftp_client in self.sftp_clients:
+            sftp_client.close()
+        self.sftp_clients = []
+        self.sftp_client = None
         if self.ssh_client:
             self.ssh_client.close()
         logger.info("SFTP connection closed")
     
-    def create_remote_directory(self, remote_dir: str):
+    def create_remote_directory(self, remote_dir: str, sftp_client: Optional[paramiko.SFTPClient] = None):
         """Create directory on remote server if it doesn't exist"""
-        try:
-            self.sftp_client.stat(remote_dir)
-        except FileNotFoundError:
-            # Directory doesn't exist, create it
-            parent_dir = os.path.dirname(remote_dir)
-            if parent_dir != remote_dir:  # Avoid infinite recursion
-                self.create_remote_directory(parent_dir)
-            
-            logger.info(f"Creating remote directory: {remote_dir}")
-            self.sftp_client.mkdir(remote_dir)
+        sftp_client = sftp_client or self.sftp_client
+        
+        # Walk up to the nearest existing ancestor, collecting the missing directories
+        missing = []
+        current_dir = remote_dir
+        while current_dir and current_dir not in self._known_remote_dirs:
+            parent_dir = os.path.dirname(current_dir)
+            # A directory whose parent was only just created can't exist yet
+            if parent_dir not in self._created_remote_dirs:
+                try:
+                    sftp_client.stat(current_dir)
+                    self._known_remote_dirs.add(current_dir)
+                    break
+                except FileNotFoundError:
+                    pass
+            missing.append(current_dir)
+            if parent_dir == current_dir:  # Reached the root
+                break
+            current_dir = parent_dir
+        
+        # Then create them back down, parents first; a failure propagates to the caller
+        for missing_dir in reversed(missing):
+            logger.info(f"Creating remote directory: {missing_dir}")
+            sftp_client.mkdir(missing_dir)
+            self._known_remote_dirs.add(missing_dir)
+            self._created_remote_dirs.add(missing_dir)
+    
+    def create_remote_directories(self, remote_files: List[str]):
+        """Create every directory the given remote files need in one pass, parents first"""
+        self.create_remote_directory(self.remote_path)
+        
+        # Every directory between remote_path and each file, shallowest first
+        remote_dirs = set()
+        for remote_file in remote_files:
+            remote_dir = os.path.dirname(remote_file)
+            while remote_dir.startswith(self.remote_path + '/') and remote_dir not in remote_dirs:
+                remote_dirs.add(remote_dir)
+                remote_dir = os.path.dirname(remote_dir)
+        
+        # Try mkdir directly; an existing directory just raises, saving the stat round-trip
+        for remote_dir in sorted(remote_dirs, key=lambda d: d.count('/')):
+            if remote_dir in self._known_remote_dirs:
+                continue
+            try:
+                self.sftp_client.mkdir(remote_dir)
+                logger.info(f"Creating remote directory: {remote_dir}")
+                self._created_remote_dirs.add(remote_dir)
+            except IOError:
+                pass
+            self._known_remote_dirs.add(remote_dir)
+    
+    def build_remote_index(self):
+        """List the remote tree once so unchanged files can be skipped"""
+        self._remote_index = {}
+        stack = [self.remote_path]
+        
+        # One listdir_attr round-trip per directory returns every entry's size and mtime
+        while stack:
+            remote_dir = stack.pop()
+            try:
+                entries = self.sftp_client.listdir_attr(remote_dir)
+            except FileNotFoundError:
+                continue
+            self._known_remote_dirs.add(remote_dir)
+            for entry in entries:
+                if self._should_exclude_name(entry.filename):
+                    continue
+                remote_file = f"{remote_dir}/{entry.filename}"
+                if stat.S_ISDIR(entry.st_mode):
+                    stack.append(remote_file)
+                else:
+                    self._remote_index[remote_file] = entry
+        self._remote_index_fresh = True
+    
+    def record_uploaded(self, local_stat: os.stat_result, remote_file: str):
+        """Update the remote index for a file just uploaded with its local mtime"""
+        self._remote_index[remote_file] = paramiko.SFTPAttributes.from_stat(local_stat)
+    
+    def is_unchanged(self, local_stat: os.stat_result, remote_file: str) -> bool:
+        """Check if the remote copy has the same size and mtime as the local file"""
+        remote_attrs = self._remote_index.get(remote_file)
+        if remote_attrs is None:
+            return False
+        return (remote_attrs.st_size == local_stat.st_size
+                and int(remote_attrs.st_mtime) == int(local_stat.st_mtime))
+    
+    def put_pipelined(self, sftp_client: paramiko.SFTPClient, local_file: str, remote_file: str):
+        """Write a file without waiting for each WRITE to be acknowledged"""
+        # Unbuffered, so paramiko slices requests straight off the source without copying it first
+        with open(local_file, 'rb') as local, sftp_client.file(remote_file, 'wb', bufsize=0) as remote:
+            # Pipelined mode keeps WRITE requests in flight; close() collects the
+            # acknowledgements and raises on any failure, so no confirming stat is needed
+            remote.set_pipelined(True)
+            if os.fstat(local.fileno()).st_size < MMAP_THRESHOLD:
+                # mmap's setup cost outweighs one small read
+                remote.write(local.read())
+            else:
+                with mmap.mmap(local.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    remote.write(mapped)
     
-    def upload_file(self, local_file: Path, remote_file: str) -> bool:
+    def upload_file(self, local_file: str, remote_file: str, sftp_client: Optional[paramiko.SFTPClient] = None,
+                    local_stat: Optional[os.stat_result] = None) -> bool:
         """Upload a single file to the remote server"""
+        sftp_client = sftp_client or self.sftp_client
         try:
             # Create remote directory if needed
             remote_dir = os.path.dirname(remote_file)
-            if remote_dir:
-                self.create_remote_directory(remote_dir)
+            if remote_dir and remote_dir not in self._known_remote_dirs:
+                with self._dir_lock:
+                    self.create_remote_directory(remote_dir, sftp_client)
             
             # Upload file
             logger.info(f"Uploading: {local_file} -> {remote_file}")
-            self.sftp_client.put(str(local_file), remote_file)
+            # Callers that scanned the tree pass the DirEntry's cached stat
+            if local_stat is None:
+                local_stat = os.stat(local_file)
+            self.put_pipelined(sftp_client, local_file, remote_file)
             
-            # Set file permissions (make scripts executable)
-            if local_file.suffix in ['.py', '.sh']:
-                try:
-                    self.sftp_client.chmod(remote_file, stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR | 
-                                          stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
-                except:
-                    pass  # Ignore chmod errors
+            # Copy the local mtime so the next deploy sees the file as unchanged
+            sftp_client.utime(remote_file, (local_stat.st_atime, local_stat.st_mtime))
+            
+            # Make scripts executable later in one batched chmod
+            if os.path.splitext(local_file)[1] in ['.py', '.sh']:
+                self._pending_chmod.append(remote_file)
             
             return True
             
@@ -182,33 +337,104 @@ class SFTPDeployer:
             logger.error(f"Failed to upload {local_file}: {str(e)}")
             return False
     
-    def get_files_to_upload(self) -> List[Path]:
-        """Get list of all files to upload"""
-        files_to_upload = []
-        
-        for root, dirs, files in os.walk(self.local_path):
-            root_path = Path(root)
+    def apply_pending_chmod(self):
+        """Make all uploaded scripts executable with a few shell calls instead of one SFTP request each"""
+        pending, self._pending_chmod = self._pending_chmod, []
+        # Chunked to stay well inside the remote shell's argument limit
+        for i in range(0, len(pending), CHMOD_BATCH_SIZE):
+            batch = pending[i:i + CHMOD_BATCH_SIZE]
+            paths = ' '.join(shlex.quote(path) for path in batch)
+            try:
+                stdin, stdout, stderr = self.ssh_client.exec_command(f"chmod {SCRIPT_MODE:o} {paths}")
+                if stdout.channel.recv_exit_status() == 0:
+                    continue
+            except Exception as e:
+                logger.warning(f"Remote chmod failed: {str(e)}")
             
-            # Filter out excluded directories
-            dirs[:] = [d for d in dirs if not self.should_exclude(root_path / d)]
+            # No usable shell (e.g. an SFTP-only account); fall back to one SFTP chmod per script
+            for remote_file in batch:
+                try:
+                    self.sftp_client.chmod(remote_file, SCRIPT_MODE)
+                except Exception as e:
+                    logger.warning(f"Could not set permissions for {remote_file}: {str(e)}")
+    
+    def upload_tar(self, local_files: List[Tuple[str, str]]) -> bool:
+        """Upload many small files, given with their relative paths, as one tar stream"""
+        logger.info(f"Streaming {len(local_files)} small files through tar")
+        
+        def set_mode(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+            # Match upload_file, which makes scripts executable
+            if os.path.splitext(tarinfo.name)[1] in ['.py', '.sh']:
+                tarinfo.mode = SCRIPT_MODE
+            return tarinfo
+        
+        try:
+            # No -m: the archived mtimes must land on the remote files for incremental deploys
+            stdin, stdout, stderr = self.ssh_client.exec_command(f"tar -xf - -C {shlex.quote(self.remote_path)}")
+            with tarfile.open(fileobj=stdin, mode='w|') as tar:
+                for local_file, arcname in local_files:
+                    tar.add(local_file, arcname=arcname, recursive=False, filter=set_mode)
+            stdin.channel.shutdown_write()
             
-            for file in files:
-                file_path = root_path / file
-                if not self.should_exclude(file_path):
-                    files_to_upload.append(file_path)
+            exit_status = stdout.channel.recv_exit_status()
+            if exit_status != 0:
+                logger.warning(f"Remote tar exited with {exit_status}: {stderr.read().decode(errors='replace').strip()}")
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Tar upload failed: {str(e)}")
+            return False
+    
+    def get_files_to_upload(self) -> List[Tuple[str, str, os.stat_result]]:
+        """Get list of all files to upload with their relative POSIX paths and stat results"""
+        files_to_upload = []
+        root = str(self.local_path)
+        stack = [root]
+        # Every entry path starts with root plus a separator, so the relative path is a slice
+        prefix_len = len(os.path.join(root, ''))
+        
+        # scandir yields names and types without a stat per entry, and excluded
+        # names are rejected before any Path object is built
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if self._should_exclude_name(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        relative_path = entry.path[prefix_len:]
+                        if os.sep != '/':
+                            relative_path = relative_path.replace(os.sep, '/')
+                        # DirEntry.stat() is cached on the entry, so each file is stat'ed once
+                        files_to_upload.append((entry.path, relative_path, entry.stat()))
         
         return files_to_upload
     
-    def deploy(self) -> bool:
-        """Deploy all files to remote server"""
-        if not self.connect():
-            return False
+    def sync(self, confirm: bool = True) -> bool:
+        """Upload changed files over the open connection"""
+        # Get list of files to upload
+        files_to_upload = self.get_files_to_upload()
         
-        try:
-            # Get list of files to upload
-            files_to_upload = self.get_files_to_upload()
-            logger.info(f"Found {len(files_to_upload)} files to upload")
-            
+        # Calculate remote paths from the relative paths found during the scan
+        remote_root = self.remote_path.rstrip('/') + '/'
+        remote_files = [remote_root + relative_path for _, relative_path, _ in files_to_upload]
+        
+        # Skip files whose remote copy already matches
+        if not self.force:
+            if not self._remote_index_fresh:
+                self.build_remote_index()
+            changed = [
+                (file_entry, remote_file)
+                for file_entry, remote_file in zip(files_to_upload, remote_files)
+                if not self.is_unchanged(file_entry[2], remote_file)
+            ]
+            logger.info(f"Skipping {len(files_to_upload) - len(changed)} unchanged files")
+            files_to_upload = [file_entry for file_entry, _ in changed]
+            remote_files = [remote_file for _, remote_file in changed]
+        logger.info(f"Found {len(files_to_upload)} files to upload")
+        
+        if confirm:
             # Confirm deployment
             print(f"\nDeployment Configuration:")
             print(f"Local Path: {self.local_path}")
@@ -219,30 +445,89 @@ class SFTPDeployer:
             if input("\nProceed with deployment? (y/N): ").lower() != 'y':
                 logger.info("Deployment cancelled by user")
                 return False
-            
-            # Upload files
-            uploaded_count = 0
-            failed_count = 0
-            
-            for file_path in files_to_upload:
-                # Calculate relative path
-                relative_path = file_path.relative_to(self.local_path)
-                remote_file_path = os.path.join(self.remote_path, str(relative_path)).replace('\\', '/')
-                
-                if self.upload_file(file_path, remote_file_path):
-                    uploaded_count += 1
-                else:
-                    failed_count += 1
-            
-            logger.info(f"Deployment completed: {uploaded_count} uploaded, {failed_count} failed")
-            return failed_count == 0
-            
+        elif not files_to_upload:
+            return True
+        
+        # Create the directory tree up front so workers never race on mkdir
+        self.create_remote_directories(remote_files)
+        
+        # Small files go in one streamed tar; SFTP handles the rest, or everything if tar fails
+        tar_count = 0
+        if self.tar_small_files:
+            small = [i for i, (_, _, file_stat) in enumerate(files_to_upload) if file_stat.st_size < TAR_THRESHOLD]
+            if len(small) > 1 and self.upload_tar([files_to_upload[i][:2] for i in small]):
+                tar_count = len(small)
+                sent = set(small)
+                for i in small:
+                    self.record_uploaded(files_to_upload[i][2], remote_files[i])
+                files_to_upload = [f for i, f in enumerate(files_to_upload) if i not in sent]
+                remote_files = [r for i, r in enumerate(remote_files) if i not in sent]
+        
+        # Upload files, each worker borrowing an idle SFTP channel
+        idle_clients: queue.Queue = queue.Queue()
+        for sftp_client in self.sftp_clients:
+            idle_clients.put(sftp_client)
+        
+        def upload(file_entry: Tuple[str, str, os.stat_result], remote_file_path: str) -> bool:
+            file_path, _, file_stat = file_entry
+            sftp_client = idle_clients.get()
+            try:
+                return self.upload_file(file_path, remote_file_path, sftp_client, file_stat)
+            finally:
+                idle_clients.put(sftp_client)
+        
+        with ThreadPoolExecutor(max_workers=len(self.sftp_clients)) as executor:
+            results = list(executor.map(upload, files_to_upload, remote_files))
+        for (_, _, file_stat), remote_file_path, ok in zip(files_to_upload, remote_files, results):
+            if ok:
+                self.record_uploaded(file_stat, remote_file_path)
+        
+        self.apply_pending_chmod()
+        
+        uploaded_count = tar_count + results.count(True)
+        failed_count = results.count(False)
+        
+        logger.info(f"Deployment completed: {uploaded_count} uploaded, {failed_count} failed")
+        return failed_count == 0
+    
+    def deploy(self) -> bool:
+        """Deploy all files to remote server"""
+        if not self.connect():
+            return False
+        
+        try:
+            return self.sync()
         except Exception as e:
             logger.error(f"Deployment failed: {str(e)}")
             return False
         finally:
             self.disconnect()
     
+    def watch(self, interval: float = 5.0):
+        """Keep one authenticated session open and upload changes as they appear"""
+        if not self.connect():
+            return
+        
+        logger.info(f"Watching {self.local_path} for changes every {interval}s (Ctrl+C to stop)")
+        try:
+            while True:
+                # Reconnect only if the server dropped the session
+                transport = self.ssh_client.get_transport()
+                if transport is None or not transport.is_active():
+                    logger.warning("SSH session lost, reconnecting")
+                    self.disconnect()
+                    if not self.connect():
+                        return
+                try:
+                    self.sync(confirm=False)
+                except Exception as e:
+                    logger.error(f"Sync failed: {str(e)}")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logger.info("Stopped watching")
+        finally:
+            self.disconnect()
+    
     def show_config(self):
         """Display current configuration"""
         print("SFTP Deployment Configuration:")
@@ -252,6 +537,8 @@ class SFTPDeployer:
         print(f"Authentication: {'Password' if self.password else 'Private Key'}")
         print(f"Private Key Path: {self.private_key_path}")
         print(f"Remote Path: {self.remote_path}")
+        print(f"Parallel Uploads: {self.workers}")
+        print(f"Tar Small Files: {'Yes' if self.tar_small_files else 'No'}")
         print(f"Local Path: {self.local_path}")
         print(f"Excluded patterns: {', '.join(sorted(self.exclude_patterns))}")
 
@@ -263,10 +550,17 @@ def main():
         if sys.argv[1] == '--config':
             deployer.show_config()
             return
+        elif sys.argv[1] == '--force':
+            deployer.force = True
+        elif sys.argv[1] == '--watch':
+            deployer.watch()
+            return
         elif sys.argv[1] == '--help':
             print("SFTP Deployment Script")
             print("Usage:")
             print("  python deploy_sftp.py           Deploy files")
+            print("  python deploy_sftp.py --force   Upload all files, even unchanged ones")
+            print("  python deploy_sftp.py --watch   Stay connected and upload changes as they happen")
             print("  python deploy_sftp.py --config  Show configuration")
             print("  python deploy_sftp.py --help    Show this help")
             print("\nEnvironment Variables:")
@@ -276,6 +570,8 @@ def main():
             print("  SFTP_PASSWORD     - SSH password (optional, uses key auth if empty)")
             print("  SFTP_KEY_PATH     - Path to private key (default: ~/.ssh/id_rsa)")
             print("  SFTP_REMOTE_PATH  - Remote directory path")
+            print("  SFTP_WORKERS      - Parallel upload channels (default: 4)")
+            print("  SFTP_TAR_SMALL_FILES - Send small files as one tar stream (default: 1, set 0 to disable)")
             return
     
     # Validate configuration
@@ -12,24 +12,28 @@ with open(filename, 'r') as f:
 
 original = content
 
-# Replacements
-content = re.sub(r'bot-service-na-west-05\.cybrancee\.com:2022', 'a remote server via SFTP', content)
-content = re.sub(r'# SFTP Configuration for bot-service-na-west-05\.cybrancee\.com', 
-                 '# SFTP Configuration - Set these in your .env file or modify directly', content)
-content = re.sub(r"self\.hostname = 'bot-service-na-west-05\.cybrancee\.com'", 
-                 "self.hostname = os.getenv('SFTP_HOST', 'your-server.com')", content)
-content = re.sub(r'self\.port = 2022', 
-                 "self.port = int(os.getenv('SFTP_PORT', '22'))", content)
+# Replacements, compiled into one alternation so the file is scanned once
+_SUBS = [
+    (r'bot-service-na-west-05\.cybrancee\.com:2022', 'a remote server via SFTP'),
+    (r'# SFTP Configuration for bot-service-na-west-05\.cybrancee\.com',
+     '# SFTP Configuration - Set these in your .env file or modify directly'),
+    (r"self\.hostname = 'bot-service-na-west-05\.cybrancee\.com'",
+     "self.hostname = os.getenv('SFTP_HOST', 'your-server.com')"),
+    (r'self\.port = 2022',
+     "self.port = int(os.getenv('SFTP_PORT', '22'))"),
+]
+_PATTERN = re.compile('|'.join(f'(?P<g{i}>{pattern})' for i, (pattern, _) in enumerate(_SUBS)))
+
+content = _PATTERN.sub(lambda m: _SUBS[int(m.lastgroup[1:])][1], content)
+
+# Also add dotenv if needed, in memory so the file is written once
+if content != original and 'from dotenv import load_dotenv' not in content:
+    content = re.sub(
+        r'^import json\n(?!from dotenv)',
+        'import json\nfrom dotenv import load_dotenv\n\n# Load environment variables\nload_dotenv()\n',
+        content, count=1, flags=re.MULTILINE
+    )
 
 if content != original:
     with open(filename, 'w') as f:
         f.write(content)
-    # Also add dotenv if needed
-    if 'from dotenv import load_dotenv' not in content and 'import json' in content:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-        with open(filename, 'w') as f:
-            for i, line in enumerate(lines):
-                f.write(line)
-                if line.strip() == 'import json' and i + 1 < len(lines) and 'from dotenv' not in lines[i+1]:
-                    f.write('from dotenv import load_dotenv\n\n# Load environment variables\nload_dotenv()\n')
@@ -63,12 +63,16 @@ class DetendezBot(commands.AutoShardedBot):
             'cogs.timestamp'
         ]
         
-        for cog in cogs_to_load:
-            try:
-                await self.load_extension(cog)
+        # Load concurrently so any awaiting in each cog's setup() overlaps
+        results = await asyncio.gather(
+            *(self.load_extension(cog) for cog in cogs_to_load),
+            return_exceptions=True
+        )
+        for cog, result in zip(cogs_to_load, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to load {cog}: {result}")
+            else:
                 logger.info(f"Loaded {cog}")
-            except Exception as e:
-                logger.error(f"Failed to load {cog}: {e}")
         
         # Defer command sync to on_ready (once), safer for sharded bots
     
@@ -97,6 +101,11 @@ class DetendezBot(commands.AutoShardedBot):
     async def on_shard_ready(self, shard_id: int):
         logger.info(f"Shard {shard_id} is ready")
     
+    async def close(self):
+        """Close the database before shutting down the bot"""
+        await self.db.close()
+        await super().close()
+    
     async def on_guild_join(self, guild):
         """Event fired when bot joins a new guild"""
         logger.info(f"Joined guild: {guild.name} (ID: {guild.id})")
@@ -5,7 +5,9 @@ Helps users configure the bot for first-time use
 """
 
 import os
+import re
 import sys
+from importlib.metadata import distributions
 
 def create_env_file():
     """Create .env file with user input"""
@@ -57,20 +59,50 @@ LOG_LEVEL=INFO
         print(f"❌ Error creating .env file: {e}")
         return False
 
+def _normalize(name):
+    """Normalize a distribution name the way pip compares them"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+def check_requirements():
+    """Return requirements.txt packages that are not installed"""
+    # Reads installed metadata only; importing each package to test for it
+    # is slow and misses names like google-generativeai (google.generativeai)
+    installed = {_normalize(dist.metadata['Name']) for dist in distributions() if dist.metadata['Name']}
+    
+    missing = []
+    with open('requirements.txt') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            name = re.split(r'[<>=!~;\[ ]', line, 1)[0]
+            if _normalize(name) not in installed:
+                missing.append(name)
+    return missing
+
 def install_dependencies():
     """Install required dependencies"""
     print("📦 Installing dependencies...")
     
     try:
         import subprocess
-        result = subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'], 
-                              capture_output=True, text=True)
+        # Stream pip's output instead of buffering the whole build log; prefer
+        # wheels over source builds, and keep them in a reusable cache
+        cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'detendezbot-pip')
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt',
+             '--prefer-binary', '--no-input', '--disable-pip-version-check',
+             '--cache-dir', cache_dir],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+        for line in process.stdout:
+            print(line, end='')
         
-        if result.returncode == 0:
+        if process.wait() == 0:
             print("✅ Dependencies installed successfully!")
             return True
         else:
-            print(f"❌ Error installing dependencies: {result.stderr}")
+            print(f"❌ Error installing dependencies (pip exited with {process.returncode})")
             return False
     except Exception as e:
         print(f"❌ Error installing dependencies: {e}")
@@ -121,7 +153,13 @@ def main():
         return
     
     # Install dependencies
-    response = input("Install dependencies from requirements.txt? (Y/n): ").strip().lower()
+    missing = check_requirements()
+    if missing:
+        print(f"📦 Missing packages: {', '.join(missing)}")
+        response = input("Install dependencies from requirements.txt? (Y/n): ").strip().lower()
+    else:
+        print("✅ All dependencies are already installed.")
+        response = 'n'
     if response not in ['n', 'no']:
         if not install_dependencies():
             print("❌ Setup failed during dependency installation.")
@@ -1,8 +1,12 @@
 """Pytest configuration and fixtures"""
+import asyncio
+import shutil
 import sys
 import os
 from pathlib import Path
 
+import pytest
+
 # Add the project root to Python path so imports work
 # This must happen before any test imports
 project_root = Path(__file__).parent.parent
@@ -19,6 +23,9 @@ elif project_root_str not in os.environ['PYTHONPATH']:
     os.environ['PYTHONPATH'] = project_root_str + os.pathsep + os.environ['PYTHONPATH']
 
 
+from database import Database
+
+
 def pytest_configure(config):
     """Pytest hook that runs before test collection"""
     # Ensure project root is in path (redundant but safe)
@@ -36,3 +43,27 @@ def pytest_collection_modifyitems(config, items):
     if project_root_str not in sys.path:
         sys.path.insert(0, project_root_str)
 
+
+
+@pytest.fixture(scope="session")
+def _schema_db(tmp_path_factory):
+    """Build the schema once; each test starts from a copy of this file"""
+    path = tmp_path_factory.mktemp("schema") / "schema.db"
+
+    async def build():
+        db = Database(str(path), durable=False)
+        await db.init_database()
+        await db.close()
+
+    asyncio.run(build())
+    return path
+
+
+@pytest.fixture
+async def fresh_db(_schema_db, tmp_path):
+    """A Database on a private copy of the pre-built schema"""
+    dst = tmp_path / "bot.db"
+    shutil.copyfile(_schema_db, dst)
+    db = Database(str(dst), durable=False)
+    yield db
+    await db.close()
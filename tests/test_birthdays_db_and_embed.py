@@ -7,10 +7,8 @@ from database import Database
 
 
 @pytest.mark.asyncio
-async def test_birthday_set_and_list(tmp_path, monkeypatch):
-    db_path = tmp_path / "birth.db"
-    db = Database(str(db_path))
-    await db.init_database()
+async def test_birthday_set_and_list(fresh_db, monkeypatch):
+    db = fresh_db
 
     # Minimal bot stub with db and methods used
     bot = SimpleNamespace(db=db, get_user=lambda uid: SimpleNamespace(display_name=f"User{uid}"))
@@ -28,10 +26,8 @@ async def test_birthday_set_and_list(tmp_path, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_generate_permanent_birthday_embed(tmp_path, monkeypatch):
-    db_path = tmp_path / "perm.db"
-    db = Database(str(db_path))
-    await db.init_database()
+async def test_generate_permanent_birthday_embed(fresh_db, monkeypatch):
+    db = fresh_db
 
     # Prepare data
     guild_id = 1
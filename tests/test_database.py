@@ -13,20 +13,23 @@ async def test_init_database_creates_tables(tmp_path):
     await db.init_database()
 
     async with aiosqlite.connect(db.db_file) as conn:
-        # Verify core tables exist
-        for table in [
-            "user_levels",
-            "starboard_messages",
-            "user_birthdays",
-            "guild_config",
-            "recent_content",
-            "music_queue",
-            "geographic_polls",
-            "geographic_selections",
-        ]:
-            async with conn.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,)) as cur:
-                row = await cur.fetchone()
-                assert row is not None, f"Missing table: {table}"
+        async with conn.execute("SELECT name FROM sqlite_master WHERE type='table'") as cur:
+            tables = {row[0] for row in await cur.fetchall()}
+
+    # Verify core tables exist
+    missing = {
+        "user_levels",
+        "starboard_messages",
+        "user_birthdays",
+        "guild_config",
+        "recent_content",
+        "geographic_polls",
+        "geographic_selections",
+    } - tables
+    assert not missing, f"Missing tables: {missing}"
+
+    # Music queues are kept in memory only
+    assert "music_queue" not in tables
 
 
 @pytest.mark.asyncio
@@ -44,17 +47,13 @@ async def test_migration_adds_birthday_permanent_columns(tmp_path):
     # Columns should now exist
     async with aiosqlite.connect(db.db_file) as conn:
         async with conn.execute("PRAGMA table_info(guild_config)") as cur:
-            columns = await cur.fetchall()
-            names = [c[1] for c in columns]
-            assert "birthday_permanent_channel" in names
-            assert "birthday_permanent_message" in names
+            names = {c[1] for c in await cur.fetchall()}
+    assert {"birthday_permanent_channel", "birthday_permanent_message"} <= names
 
 
 @pytest.mark.asyncio
-async def test_guild_config_update_and_fetch(tmp_path):
-    db_path = tmp_path / "config.db"
-    db = Database(str(db_path))
-    await db.init_database()
+async def test_guild_config_update_and_fetch(fresh_db):
+    db = fresh_db
 
     guild_id = 12345
     await db.create_default_guild_config(guild_id)
@@ -66,3 +65,315 @@ async def test_guild_config_update_and_fetch(tmp_path):
     assert cfg["question_time"] == "10:30"
 
 
+
+
+@pytest.mark.asyncio
+async def test_guild_config_defaults_match_stored_row(fresh_db):
+    db = fresh_db
+
+    # First call inserts the row and returns the in-memory defaults
+    created = await db.get_guild_config(555)
+    # A fresh instance has an empty cache and reads the row back from the table
+    reopened = Database(db.db_file)
+    stored = await reopened.get_guild_config(555)
+    assert created == stored
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_user_level_upserts(fresh_db):
+    db = fresh_db
+
+    await db.set_user_level(1, 10, 3)
+    await db.set_user_level(1, 10, 5)
+    data = await db.get_user_level_data(1, 10)
+    assert data["level"] == 5
+    assert data["xp"] == Database.calculate_xp_for_level(5)
+
+    await db.update_user_xp(2, 10, 100)
+    await db.update_user_xp(2, 10, 60)
+    data = await db.get_user_level_data(2, 10)
+    assert data["xp"] == 160
+    assert data["level"] == Database.calculate_level_from_xp(160)
+
+    # A second birthday for the same user moves it rather than adding a row
+    await db.set_user_birthday(3, 10, 1, 2)
+    await db.set_user_birthday(3, 10, 6, 7)
+    assert await db.get_birthdays_for_date(10, 1, 2) == []
+    assert await db.get_birthdays_for_date(10, 6, 7) == [3]
+
+    await db.set_user_birthday(4, 20, 6, 7)
+    assert await db.get_all_birthdays_for_date(6, 7) == {10: [3], 20: [4]}
+
+
+@pytest.mark.asyncio
+async def test_cleanup_user_data_single_and_bulk(fresh_db):
+    db = fresh_db
+
+    guild_id = 9
+    for user_id in (1, 2, 3):
+        await db.set_user_level(user_id, guild_id, 2)
+        await db.set_user_birthday(user_id, guild_id, 4, user_id)
+
+    await db.cleanup_user_data(1, guild_id)
+    assert await db.get_user_level_data(1, guild_id) is None
+
+    await db.cleanup_users_data([2, 3], guild_id)
+    assert await db.get_user_level_data(2, guild_id) is None
+    assert await db.get_user_level_data(3, guild_id) is None
+    assert await db.get_birthdays_for_month(guild_id, 4) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_add_xp_and_birthdays(fresh_db):
+    db = fresh_db
+
+    guild_id = 3
+    await db.bulk_add_xp([(1, guild_id, 100), (2, guild_id, 500), (1, guild_id, 60)])
+    first = await db.get_user_level_data(1, guild_id)
+    second = await db.get_user_level_data(2, guild_id)
+    assert first["xp"] == 160
+    assert first["level"] == Database.calculate_level_from_xp(160)
+    assert second["level"] == Database.calculate_level_from_xp(500)
+
+    await db.bulk_set_birthdays([(1, guild_id, 6, 20), (2, guild_id, 6, 2), (1, guild_id, 6, 21)])
+    june = await db.get_birthdays_for_month(guild_id, 6)
+    assert [(b["user_id"], b["day"]) for b in june] == [(2, 2), (1, 21)]
+
+
+@pytest.mark.asyncio
+async def test_sql_level_lookup_matches_python(fresh_db):
+    db = fresh_db
+
+    total = 0
+    for step in (0, 99, 1, 54, 1, 500, 5000, 123456):
+        await db.update_user_xp(1, 1, step)
+        total += step
+        data = await db.get_user_level_data(1, 1)
+        assert data["level"] == Database.calculate_level_from_xp(total)
+
+    await db.update_user_xp(1, 1, -total - 10)
+    data = await db.get_user_level_data(1, 1)
+    assert data["level"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sql_level_past_seeded_thresholds_matches_python(fresh_db):
+    db = fresh_db
+
+    # Level 1000 is the highest seeded threshold; totals beyond it use the closed form
+    total = 0
+    for step in (5_100_000, 200_000, 50_000_000):
+        result = await db.update_user_xp(1, 1, step)
+        total += step
+        assert result["level"] == Database.calculate_level_from_xp(total)
+        assert result["level"] > 1000
+    assert (await db.get_user_level_data(1, 1))["level"] == Database.calculate_level_from_xp(total)
+
+    await db.bulk_add_xp([(2, 1, 6_000_000)])
+    assert (await db.get_user_level_data(2, 1))["level"] == Database.calculate_level_from_xp(6_000_000)
+
+
+@pytest.mark.asyncio
+async def test_recent_content_posted_today(fresh_db):
+    db = fresh_db
+
+    assert await db.has_posted_today(1, "fact") is False
+    await db.add_recent_content(1, "fact", "Octopuses have three hearts.")
+    assert await db.has_posted_today(1, "fact") is True
+    assert await db.has_posted_today(1, "question") is False
+
+    # A fresh instance rebuilds the mirror from the table
+    reloaded = Database(db.db_file)
+    assert await reloaded.has_posted_today(1, "fact") is True
+    await reloaded.close()
+
+    # Entries past the retention window are pruned by the next insert
+    async with aiosqlite.connect(db.db_file) as conn:
+        await conn.execute(
+            "INSERT INTO recent_content (guild_id, content_type, content, posted_date) "
+            "VALUES (1, 'fact', 'Old fact', DATE('now', '-90 days'))"
+        )
+        await conn.commit()
+    await db.add_recent_content(2, "fact", "Bananas are berries.")
+    assert sorted(await db.get_recent_content("fact")) == ["Bananas are berries.", "Octopuses have three hearts."]
+    async with aiosqlite.connect(db.db_file) as conn:
+        async with conn.execute("SELECT COUNT(*) FROM recent_content WHERE content = 'Old fact'") as cur:
+            assert (await cur.fetchone())[0] == 0
+
+
+@pytest.mark.asyncio
+async def test_guild_config_update_rejects_unknown_columns(fresh_db):
+    db = fresh_db
+
+    with pytest.raises(ValueError):
+        await db.update_guild_config(1, **{"xp_per_message = 0; --": 1})
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_order_and_rank(fresh_db):
+    db = fresh_db
+
+    await db.bulk_add_xp([(1, 5, 300), (2, 5, 900), (3, 5, 50), (4, 6, 10000)])
+    board = await db.get_leaderboard(5, limit=2)
+    assert [(e["user_id"], e["rank"]) for e in board] == [(2, 1), (1, 2)]
+
+
+@pytest.mark.asyncio
+async def test_update_user_xp_reports_level_up(fresh_db):
+    db = fresh_db
+
+    result = await db.update_user_xp(1, 1, 50)
+    assert result == {"xp": 50, "level": 1, "old_level": 1, "leveled_up": False}
+
+    result = await db.update_user_xp(1, 1, 200)
+    assert result["xp"] == 250
+    assert result["level"] == Database.calculate_level_from_xp(250)
+    assert result["old_level"] == 1
+    assert result["leveled_up"] is True
+
+    # Crossing the highest seeded threshold still reports a consistent level-up
+    result = await db.update_user_xp(1, 1, 5_100_000)
+    old_level = result["level"]
+    result = await db.update_user_xp(1, 1, 200_000)
+    assert result["old_level"] == old_level
+    assert result["level"] > result["old_level"]
+    assert result["leveled_up"] is True
+
+
+@pytest.mark.asyncio
+async def test_init_database_enables_wal(tmp_path):
+    db_path = tmp_path / "wal.db"
+    db = Database(str(db_path))
+    try:
+        await db.init_database()
+
+        # journal_mode is persistent, so a plain connection sees it too
+        async with aiosqlite.connect(db.db_file) as conn:
+            async with conn.execute("PRAGMA journal_mode") as cur:
+                assert (await cur.fetchone())[0] == "wal"
+    finally:
+        await db.close()
+
+
+def _level_from_xp_loop(xp):
+    level = 1
+    while xp >= 5 * level ** 2 + 50 * level + 100:
+        level += 1
+    return level
+
+
+def test_calculate_level_from_xp_matches_loop():
+    for xp in range(-10, 20_000):
+        assert Database.calculate_level_from_xp(xp) == _level_from_xp_loop(xp)
+
+    # Check either side of every threshold up to ~10M XP
+    for level in range(1, 1420):
+        threshold = 5 * level ** 2 + 50 * level + 100
+        for xp in (threshold - 1, threshold, threshold + 1):
+            assert Database.calculate_level_from_xp(xp) == _level_from_xp_loop(xp)
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes(fresh_db):
+    db = fresh_db
+
+    async def plan(sql, params):
+        async with aiosqlite.connect(db.db_file) as conn:
+            async with conn.execute(f"EXPLAIN QUERY PLAN {sql}", params) as cur:
+                return " ".join(row[3] for row in await cur.fetchall())
+
+    # Both birthday indexes cover the per-guild lookup; either is an equality search
+    assert "USING COVERING INDEX idx_bday_" in await plan(
+        "SELECT user_id FROM user_birthdays WHERE guild_id = ? AND birth_month = ? AND birth_day = ?", (1, 2, 3)
+    )
+    assert "idx_bday_month_day" in await plan(
+        "SELECT guild_id, user_id FROM user_birthdays WHERE birth_month = ? AND birth_day = ?", (2, 3)
+    )
+    assert "idx_geo_sel_msg" in await plan(
+        "SELECT region, COUNT(*) FROM geographic_selections WHERE message_id = ? AND guild_id = ? GROUP BY region",
+        (1, 2),
+    )
+
+    # Top-K walks idx_levels_guild_xp in order instead of sorting the whole guild
+    leaderboard = await plan(
+        "SELECT user_id, xp, level FROM user_levels WHERE guild_id = ? ORDER BY xp DESC LIMIT ?", (1, 10)
+    )
+    assert "idx_levels_guild_xp" in leaderboard
+    assert "TEMP B-TREE" not in leaderboard
+
+    # The daily reload and the retention prune both search by posted_date
+    assert "USING COVERING INDEX idx_recent_date" in await plan(
+        "SELECT guild_id, content_type FROM recent_content WHERE posted_date = ?", ("2024-01-01",)
+    )
+    assert "idx_recent_date" in await plan(
+        "DELETE FROM recent_content WHERE posted_date < DATE('now', ?)", ("-60 days",)
+    )
+    assert "idx_recent_ct_date" in await plan(
+        "SELECT content FROM recent_content WHERE content_type = ? AND posted_date > DATE('now', ?) "
+        "ORDER BY posted_date DESC LIMIT ?",
+        ("fact", "-60 days", 50),
+    )
+
+    # user_id is the rowid alias, so timezone lookups are a direct b-tree search
+    assert "INTEGER PRIMARY KEY" in await plan(
+        "SELECT timezone FROM user_timezones WHERE user_id = ?", (1,)
+    )
+
+
+@pytest.mark.asyncio
+async def test_migration_converts_tables_to_without_rowid(tmp_path):
+    db_path = tmp_path / "rowid.db"
+
+    # Old schema: rowid table with existing data
+    async with aiosqlite.connect(str(db_path)) as conn:
+        await conn.execute(
+            "CREATE TABLE starboard_messages (original_message_id INTEGER, starboard_message_id INTEGER, "
+            "guild_id INTEGER, star_count INTEGER DEFAULT 0, PRIMARY KEY (original_message_id, guild_id))"
+        )
+        await conn.execute("INSERT INTO starboard_messages VALUES (1, 2, 3, 4)")
+        await conn.commit()
+
+    db = Database(str(db_path))
+    try:
+        await db.init_database()
+
+        async with aiosqlite.connect(db.db_file) as conn:
+            async with conn.execute("SELECT sql FROM sqlite_master WHERE name = 'starboard_messages'") as cur:
+                assert "WITHOUT ROWID" in (await cur.fetchone())[0]
+        assert await db.get_starboard_message(1, 3) == {"starboard_message_id": 2, "star_count": 4}
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_guild_config_cache_invalidated_on_update(fresh_db):
+    db = fresh_db
+
+    cfg = await db.get_guild_config(7)
+    # Callers get a copy, so mutating it leaves the cached row intact
+    cfg["xp_per_message"] = 999
+    assert (await db.get_guild_config(7))["xp_per_message"] == 15
+
+    await db.update_guild_config(7, xp_per_message=30)
+    assert 7 not in db._cfg_cache
+    assert (await db.get_guild_config(7))["xp_per_message"] == 30
+
+
+@pytest.mark.asyncio
+async def test_birthday_lookup_removal_and_guild_reset(fresh_db):
+    db = fresh_db
+
+    guild_id = 11
+    await db.bulk_set_birthdays([(1, guild_id, 12, 1), (2, guild_id, 3, 9)])
+    assert await db.get_user_birthday(1, guild_id) == (12, 1)
+    assert await db.get_guild_birthdays(guild_id) == [(2, 3, 9), (1, 12, 1)]
+
+    await db.remove_user_birthday(1, guild_id)
+    assert await db.get_user_birthday(1, guild_id) is None
+
+    await db.set_user_level(1, guild_id, 3)
+    await db.set_user_level(1, guild_id + 1, 3)
+    await db.reset_guild_levels(guild_id)
+    assert await db.get_leaderboard(guild_id) == []
+    assert await db.get_user_level_data(1, guild_id + 1) is not None
@@ -5,10 +5,8 @@ from database import Database
 
 
 @pytest.mark.asyncio
-async def test_starboard_crud(tmp_path):
-    db_path = tmp_path / "sb.db"
-    db = Database(str(db_path))
-    await db.init_database()
+async def test_starboard_crud(fresh_db):
+    db = fresh_db
 
     guild_id = 1
     orig_id = 111
@@ -30,10 +28,8 @@ async def test_starboard_crud(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_geographic_poll_and_results(tmp_path):
-    db_path = tmp_path / "geo.db"
-    db = Database(str(db_path))
-    await db.init_database()
+async def test_geographic_poll_and_results(fresh_db):
+    db = fresh_db
 
     guild_id = 42
     message_id = 999
@@ -62,3 +58,71 @@ async def test_geographic_poll_and_results(tmp_path):
     assert results.get("West Coast", 0) == 1
 
 
+@pytest.mark.asyncio
+async def test_bulk_add_geographic_selections_matches_single_adds(fresh_db):
+    db = fresh_db
+
+    await db.add_geographic_poll(1, 2, "Poll", 3)
+    await db.bulk_add_geographic_selections([
+        (5, 1, 2, "West"),
+        (6, 1, 2, "West"),
+        (7, 1, 2, "East"),
+        (6, 1, 2, "South"),
+    ])
+    assert await db.get_geographic_results(1, 2) == {"West": 1, "East": 1, "South": 1}
+
+    selections = await db.get_user_geographic_selections(6, 2)
+    assert [s["region"] for s in selections] == ["South"]
+
+
+
+
+@pytest.mark.asyncio
+async def test_replace_geographic_selection(fresh_db):
+    db = fresh_db
+
+    await db.add_geographic_poll(1, 2, "Poll", 3)
+    await db.replace_geographic_selection(user_id=5, message_id=1, guild_id=2, region="Midwest")
+    await db.replace_geographic_selection(user_id=5, message_id=1, guild_id=2, region="South")
+
+    results = await db.get_geographic_results(1, 2)
+    assert results == {"South": 1}
+
+
+@pytest.mark.asyncio
+async def test_geographic_counts_track_selections(fresh_db):
+    db = fresh_db
+
+    await db.add_geographic_poll(1, 2, "Poll", 3)
+    await db.add_geographic_selection(user_id=5, message_id=1, guild_id=2, region="West")
+    await db.add_geographic_selection(user_id=6, message_id=1, guild_id=2, region="West")
+    await db.add_geographic_selection(user_id=6, message_id=1, guild_id=2, region="South")
+    assert await db.get_geographic_results(1, 2) == {"West": 1, "South": 1}
+
+    await db.remove_geographic_selection(user_id=5, message_id=1, guild_id=2)
+    assert await db.get_geographic_results(1, 2) == {"South": 1}
+
+    # Counters are rebuilt from the selections when missing
+    async with aiosqlite.connect(db.db_file) as conn:
+        await conn.execute("DROP TABLE geographic_counts")
+        await conn.commit()
+    await db.init_database()
+    assert await db.get_geographic_results(1, 2) == {"South": 1}
+
+
+@pytest.mark.asyncio
+async def test_geographic_counts_match_group_by(fresh_db):
+    db = fresh_db
+
+    await db.add_geographic_poll(1, 2, "Poll", 3)
+    await db.bulk_add_geographic_selections([(u, 1, 2, "West" if u % 3 else "East") for u in range(30)])
+    await db.replace_geographic_selection(user_id=4, message_id=1, guild_id=2, region="North")
+    await db.remove_geographic_selection(user_id=5, message_id=1, guild_id=2)
+    await db.remove_user_geographic_selection(user_id=6, message_id=1, guild_id=2)
+
+    async with aiosqlite.connect(db.db_file) as conn:
+        async with conn.execute(
+            "SELECT region, COUNT(*) FROM geographic_selections WHERE message_id = 1 AND guild_id = 2 GROUP BY region"
+        ) as cur:
+            expected = {row[0]: row[1] for row in await cur.fetchall()}
+    assert await db.get_geographic_results(1, 2) == expected
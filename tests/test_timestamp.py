@@ -10,11 +10,9 @@ from database import Database
 
 
 @pytest.mark.asyncio
-async def test_database_timezone_operations(tmp_path):
+async def test_database_timezone_operations(fresh_db):
     """Test database timezone CRUD operations"""
-    db_path = tmp_path / "timezone.db"
-    db = Database(str(db_path))
-    await db.init_database()
+    db = fresh_db
 
     user_id = 12345
     timezone = "America/New_York"
@@ -32,8 +30,30 @@ async def test_database_timezone_operations(tmp_path):
     retrieved = await db.get_user_timezone(user_id)
     assert retrieved == new_timezone
 
-    # Test getting non-existent timezone
+    # Test getting non-existent timezone; misses aren't cached
     assert await db.get_user_timezone(99999) is None
+    assert 99999 not in db._tz_cache
+
+    await db.set_user_timezone(99999, timezone)
+    assert await db.get_user_timezone(99999) == timezone
+    reopened = Database(db.db_file)
+    assert await reopened.get_user_timezone(99999) == timezone
+
+    # Re-setting the cached value still writes, so a change made elsewhere is overwritten
+    await reopened.set_user_timezone(99999, new_timezone)
+    await db.set_user_timezone(99999, timezone)
+    reopened._tz_cache.clear()
+    assert await reopened.get_user_timezone(99999) == timezone
+    await reopened.close()
+
+    # The cache is bounded, evicting the least recently used user first
+    with patch("database._TZ_CACHE_SIZE", 2):
+        db._tz_cache.clear()
+        await db.set_user_timezone(1, timezone)
+        await db.set_user_timezone(2, timezone)
+        await db.get_user_timezone(1)
+        await db.set_user_timezone(3, timezone)
+        assert list(db._tz_cache) == [1, 3]
 
 
 @pytest.mark.asyncio
@@ -53,15 +73,10 @@ async def test_database_timezone_table_exists(tmp_path):
 
 
 @pytest.fixture
-def timestamp_cog(tmp_path):
+def timestamp_cog(fresh_db):
     """Create a TimestampCog instance with a temporary database"""
-    db_path = tmp_path / "test.db"
-    db = Database(str(db_path))
-    
-    bot = SimpleNamespace(db=db)
-    cog = TimestampCog.__new__(TimestampCog)
-    cog.bot = bot
-    return cog
+    bot = SimpleNamespace(db=fresh_db)
+    return TimestampCog(bot)
 
 
 @pytest.mark.asyncio
@@ -281,6 +296,27 @@ async def test_convert_patterns_multiple(timestamp_cog):
     assert len(results) >= 2  # Should detect both times
 
 
+@pytest.mark.asyncio
+async def test_convert_patterns_unknown_timezone_converts_nothing(timestamp_cog):
+    """An unusable stored timezone yields no conversions instead of raising"""
+    assert await timestamp_cog._convert_patterns("Let's meet at 10pm", "Not/AZone") == []
+
+
+@pytest.mark.asyncio
+async def test_convert_patterns_reuses_parses_until_they_pass(timestamp_cog):
+    """Repeated text is served from the parse cache while its timestamp is still ahead"""
+    timezone = "America/New_York"
+    
+    first = await timestamp_cog._convert_patterns("Dec 5 at 3pm", timezone)
+    with patch.object(timestamp_cog, "_parse_combined", side_effect=AssertionError("not cached")):
+        assert await timestamp_cog._convert_patterns("Dec 5 at 3pm", timezone) == first
+    
+    # An entry whose timestamp has passed is parsed again
+    for key in list(timestamp_cog._parse_cache):
+        timestamp_cog._parse_cache[key] = 0
+    assert await timestamp_cog._convert_patterns("Dec 5 at 3pm", timezone) == first
+
+
 @pytest.mark.asyncio
 async def test_on_message_ignores_bot_messages(timestamp_cog):
     """Test that bot messages are ignored"""
@@ -314,8 +350,6 @@ async def test_on_message_ignores_non_general_channels(timestamp_cog):
 @pytest.mark.asyncio
 async def test_on_message_prompts_for_timezone_when_not_set(timestamp_cog):
     """Test that user is prompted to set timezone when not configured"""
-    await timestamp_cog.bot.db.init_database()
-    
     message = MagicMock()
     message.author.bot = False
     message.author.id = 12345
@@ -337,8 +371,6 @@ async def test_on_message_prompts_for_timezone_when_not_set(timestamp_cog):
 @pytest.mark.asyncio
 async def test_on_message_converts_when_timezone_set(timestamp_cog):
     """Test that timestamps are converted when timezone is set"""
-    await timestamp_cog.bot.db.init_database()
-    
     user_id = 12345
     timezone = "America/New_York"
     await timestamp_cog.bot.db.set_user_timezone(user_id, timezone)
@@ -364,8 +396,6 @@ async def test_on_message_converts_when_timezone_set(timestamp_cog):
 @pytest.mark.asyncio
 async def test_set_timezone_command_valid_timezone(timestamp_cog):
     """Test /set-timezone command with valid timezone"""
-    await timestamp_cog.bot.db.init_database()
-    
     interaction = AsyncMock()
     interaction.user.id = 12345
     interaction.response.send_message = AsyncMock()
@@ -387,8 +417,6 @@ async def test_set_timezone_command_valid_timezone(timestamp_cog):
 @pytest.mark.asyncio
 async def test_set_timezone_command_invalid_timezone(timestamp_cog):
     """Test /set-timezone command with invalid timezone"""
-    await timestamp_cog.bot.db.init_database()
-    
     interaction = AsyncMock()
     interaction.user.id = 12345
     interaction.response.send_message = AsyncMock()
@@ -409,8 +437,6 @@ async def test_set_timezone_command_invalid_timezone(timestamp_cog):
 @pytest.mark.asyncio
 async def test_my_timezone_command_no_timezone_set(timestamp_cog):
     """Test /my-timezone command when no timezone is set"""
-    await timestamp_cog.bot.db.init_database()
-    
     interaction = AsyncMock()
     interaction.user.id = 12345
     interaction.response.send_message = AsyncMock()
@@ -428,8 +454,6 @@ async def test_my_timezone_command_no_timezone_set(timestamp_cog):
 @pytest.mark.asyncio
 async def test_my_timezone_command_with_timezone_set(timestamp_cog):
     """Test /my-timezone command when timezone is set"""
-    await timestamp_cog.bot.db.init_database()
-    
     user_id = 12345
     timezone = "Europe/London"
     await timestamp_cog.bot.db.set_user_timezone(user_id, timezone)
@@ -448,6 +472,41 @@ async def test_my_timezone_command_with_timezone_set(timestamp_cog):
     assert timezone in embed.description
 
 
+@pytest.mark.asyncio
+async def test_timezones_stored_in_any_case_still_work(timestamp_cog):
+    """Names pytz accepted case-insensitively keep converting and display canonically"""
+    user_id = 12345
+    await timestamp_cog.bot.db.set_user_timezone(user_id, "america/new_york")
+    
+    results = await timestamp_cog._convert_patterns("meet at 3pm", "america/new_york")
+    assert results and results[0][2] == "3pm"
+    
+    interaction = AsyncMock()
+    interaction.user.id = user_id
+    interaction.response.send_message = AsyncMock()
+    await timestamp_cog.my_timezone.callback(timestamp_cog, interaction)
+    embed = interaction.response.send_message.call_args[1]['embed']
+    assert "America/New_York" in embed.description
+    
+    # /set-timezone accepts any case and stores the canonical spelling
+    interaction.response.send_message = AsyncMock()
+    await timestamp_cog.set_timezone.callback(timestamp_cog, interaction, "europe/london")
+    assert await timestamp_cog.bot.db.get_user_timezone(user_id) == "Europe/London"
+
+
+@pytest.mark.asyncio
+async def test_my_timezone_command_unknown_stored_timezone(timestamp_cog):
+    """An unusable stored timezone gets an invalid-timezone reply instead of raising"""
+    await timestamp_cog.bot.db.set_user_timezone(12345, "Not/AZone")
+    
+    interaction = AsyncMock()
+    interaction.user.id = 12345
+    interaction.response.send_message = AsyncMock()
+    await timestamp_cog.my_timezone.callback(timestamp_cog, interaction)
+    
+    assert "❌" in interaction.response.send_message.call_args[0][0]
+
+
 @pytest.mark.asyncio
 async def test_parse_time_handles_past_time(timestamp_cog):
     """Test that past times are assumed to be tomorrow"""
@@ -521,8 +580,6 @@ async def test_on_message_handles_channel_without_name_attribute(timestamp_cog):
 @pytest.mark.asyncio
 async def test_on_message_no_patterns_detected(timestamp_cog):
     """Test that message listener doesn't reply when no patterns are detected"""
-    await timestamp_cog.bot.db.init_database()
-    
     user_id = 12345
     timezone = "America/New_York"
     await timestamp_cog.bot.db.set_user_timezone(user_id, timezone)
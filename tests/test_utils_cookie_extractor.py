@@ -33,3 +33,22 @@ def test_basic_cookies_file_write_and_cleanup(tmp_path):
     assert not os.path.exists(extractor.cookies_file)
 
 
+def test_extract_cookies_basic_mode_skips_identical_rewrite(tmp_path, monkeypatch):
+    import asyncio
+    import utils.cookie_extractor as cookie_extractor
+
+    monkeypatch.setattr(cookie_extractor, "SELENIUM_AVAILABLE", False)
+    extractor = YouTubeCookieExtractor()
+    extractor.cookies_file = str(tmp_path / "youtube_cookies.txt")
+
+    assert asyncio.run(extractor.extract_cookies()) == extractor.cookies_file
+    content = open(extractor.cookies_file, "r", encoding="utf-8").read()
+    assert content == "\n".join(extractor._create_basic_cookies())
+
+    # A forced refresh with the same content only refreshes the mtime
+    old = time.time() - 7200
+    os.utime(extractor.cookies_file, (old, old))
+    assert not extractor._cookies_are_fresh()
+    asyncio.run(extractor.extract_cookies(force_refresh=True))
+    assert extractor._cookies_are_fresh()
+    assert open(extractor.cookies_file, "r", encoding="utf-8").read() == content
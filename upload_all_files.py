@@ -4,21 +4,52 @@ SFTP Upload Script for DetendezBot
 Uploads all files in the current directory to a remote server via SFTP
 """
 
+import asyncio
 import os
+import posixpath
 import sys
+import shlex
 import stat
+import tarfile
+import queue
+import threading
 import paramiko
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Set, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Set, Optional, Tuple
 import logging
 from getpass import getpass
 import base64
 import json
 from dotenv import load_dotenv
 
+try:
+    import asyncssh
+    ASYNCSSH_AVAILABLE = True
+except ImportError:
+    ASYNCSSH_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+# SSH channel receive window; a larger window keeps more pipelined writes in flight
+WINDOW_SIZE = 4 * 1024 * 1024
+
+# Local read size when streaming a file; bounds memory without starving the pipeline
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Paths per remote `mkdir -p` or `chmod`, well inside the shell's argument limit
+MKDIR_BATCH_SIZE = 100
+CHMOD_BATCH_SIZE = 100
+
+# WRITE requests asyncssh keeps in flight per file
+ASYNC_MAX_REQUESTS = 16
+
+# Files smaller than this are sent together as one tar stream rather than one SFTP write each
+TAR_THRESHOLD = 64 * 1024
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,6 +67,14 @@ class SFTPUploader:
         self.username = None  # Will be prompted
         self.password = None  # Will be prompted
         self.remote_path = os.getenv('SFTP_REMOTE_PATH', '')
+        # Number of SFTP channels uploading in parallel over the one SSH connection
+        self.workers = max(1, int(os.getenv('SFTP_WORKERS', '4')))
+        # Stream small files through a remote `tar -x` instead of individual SFTP writes
+        self.tar_small_files = os.getenv('SFTP_TAR_SMALL_FILES', '1') != '0'
+        # Send the SFTP uploads over an asyncssh session instead of paramiko worker threads
+        self.use_asyncssh = os.getenv('SFTP_ASYNC', '0') == '1'
+        # Upload every file even when the remote copy already matches
+        self.force = False
         
         # Local configuration
         self.local_path = Path.cwd()
@@ -79,44 +118,50 @@ class SFTPUploader:
             'dist',
             'build'
         }
+        self._compile_exclude_patterns()
         
         # SFTP connection
         self.ssh_client = None
         self.sftp_client = None
+        # Every open SFTP channel, sftp_client first
+        self.sftp_clients: List[paramiko.SFTPClient] = []
+        # Channels not currently lent out by borrow_sftp_client
+        self._idle_clients: queue.Queue = queue.Queue()
+        # Remote directories known to exist, so each is stat'ed at most once per connection
+        self._known_remote_dirs: Set[str] = set()
+        # The subset created by this connection; their children need no stat at all
+        self._created_remote_dirs: Set[str] = set()
+        # Remote file path -> attributes, filled by build_remote_index
+        self._remote_index: Dict[str, paramiko.SFTPAttributes] = {}
+        # Uploaded scripts awaiting one batched chmod
+        self._pending_chmod: List[str] = []
+    
+    def _compile_exclude_patterns(self):
+        """Split the exclusion patterns by kind so each check is a set lookup or str method call"""
+        # The script itself and the saved credentials are never uploaded
+        self._exclude_exact = frozenset(
+            {p for p in self.exclude_patterns if not p.startswith('*') and not p.endswith('*')}
+            | {'upload_all_files.py', '.upload_config'}
+        )
+        self._exclude_contains = tuple(
+            p[1:-1] for p in self.exclude_patterns if p.startswith('*') and p.endswith('*')
+        )
+        self._exclude_suffixes = tuple(p[1:] for p in self.exclude_patterns if p.startswith('*') and not p.endswith('*'))
+        self._exclude_prefixes = tuple(p[:-1] for p in self.exclude_patterns if p.endswith('*') and not p.startswith('*'))
+    
+    def _should_exclude_name(self, name: str) -> bool:
+        """Check a single file or directory name against the compiled exclusion patterns"""
+        return (
+            name in self._exclude_exact
+            or name.endswith(self._exclude_suffixes)
+            or name.startswith(self._exclude_prefixes)
+            or any(part in name for part in self._exclude_contains)
+        )
     
     def should_exclude(self, path: Path) -> bool:
         """Check if a file or directory should be excluded from upload"""
-        path_str = str(path).replace('\\', '/')
-        name = path.name
-        
-        # Check if this is the upload script itself
-        if name == 'upload_all_files.py':
-            return True
-        
-        # Always exclude the config file regardless of location
-        # Use boundary-aware checks to avoid false matches
-        if name == '.upload_config' or '/.upload_config/' in path_str or path_str.endswith('/.upload_config'):
-            return True
-            
-        for pattern in self.exclude_patterns:
-            if pattern.startswith('*') and pattern.endswith('*'):
-                # Contains pattern (e.g., *cache*)
-                if pattern[1:-1] in name:
-                    return True
-            elif pattern.startswith('*'):
-                # Ends with pattern (e.g., *.pyc)
-                if name.endswith(pattern[1:]):
-                    return True
-            elif pattern.endswith('*'):
-                # Starts with pattern (e.g., cache*)
-                if name.startswith(pattern[:-1]):
-                    return True
-            else:
-                # Exact match - check both name and full path
-                if name == pattern or path_str.endswith(f'/{pattern}') or f'/{pattern}/' in path_str:
-                    return True
-        
-        return False
+        # Exact names also exclude everything beneath a matching directory
+        return self._should_exclude_name(path.name) or not self._exclude_exact.isdisjoint(path.parts)
     
     def load_credentials(self) -> Optional[Tuple[str, str]]:
         """Load saved credentials from config file"""
@@ -217,9 +262,28 @@ class SFTPUploader:
                 timeout=30
             )
             
+            # Channels opened from here on (every SFTP session) use the larger window
+            self.ssh_client.get_transport().default_window_size = WINDOW_SIZE
+            
             # Create SFTP client
             self.sftp_client = self.ssh_client.open_sftp()
-            logger.info("SFTP connection established successfully")
+            self.sftp_clients = [self.sftp_client]
+            self._known_remote_dirs.clear()
+            self._created_remote_dirs.clear()
+            
+            # Extra channels for parallel uploads; the server's MaxSessions may cap these
+            for _ in range(self.workers - 1):
+                try:
+                    self.sftp_clients.append(self.ssh_client.open_sftp())
+                except Exception as e:
+                    logger.warning(f"Could only open {len(self.sftp_clients)} SFTP channels: {str(e)}")
+                    break
+            
+            self._idle_clients = queue.Queue()
+            for sftp_client in self.sftp_clients:
+                self._idle_clients.put(sftp_client)
+            
+            logger.info(f"SFTP connection established successfully ({len(self.sftp_clients)} channels)")
             return True
             
         except paramiko.AuthenticationException:
@@ -234,85 +298,277 @@ class SFTPUploader:
     
     def disconnect(self):
         """Close SFTP connection"""
-        if self.sftp_client:
-            self.sftp_client.close()
+        for sftp_client in self.sftp_clients:
+            sftp_client.close()
+        self.sftp_clients = []
         if self.ssh_client:
             self.ssh_client.close()
         logger.info("SFTP connection closed")
     
+    @contextmanager
+    def borrow_sftp_client(self) -> Iterator[paramiko.SFTPClient]:
+        """Lend out an idle SFTP channel, waiting for one if all are busy"""
+        sftp_client = self._idle_clients.get()
+        try:
+            yield sftp_client
+        finally:
+            self._idle_clients.put(sftp_client)
+    
     def create_remote_directory(self, remote_dir: str):
         """Create directory on remote server if it doesn't exist"""
-        try:
-            self.sftp_client.stat(remote_dir)
-        except FileNotFoundError:
-            # Directory doesn't exist, create it
-            parent_dir = os.path.dirname(remote_dir)
-            if parent_dir and parent_dir != remote_dir:  # Avoid infinite recursion
-                self.create_remote_directory(parent_dir)
-            
+        # Walk up to the nearest existing ancestor, collecting the missing directories
+        missing = []
+        current_dir = remote_dir
+        while current_dir and current_dir not in self._known_remote_dirs:
+            parent_dir = os.path.dirname(current_dir)
+            # A directory whose parent was only just created can't exist yet
+            if parent_dir not in self._created_remote_dirs:
+                try:
+                    self.sftp_client.stat(current_dir)
+                    self._known_remote_dirs.add(current_dir)
+                    break
+                except FileNotFoundError:
+                    pass
+            missing.append(current_dir)
+            if parent_dir == current_dir:  # Reached the root
+                break
+            current_dir = parent_dir
+        
+        # Then create them back down, parents first
+        for missing_dir in reversed(missing):
+            try:
+                logger.info(f"Creating remote directory: {missing_dir}")
+                self.sftp_client.mkdir(missing_dir)
+                self._known_remote_dirs.add(missing_dir)
+                self._created_remote_dirs.add(missing_dir)
+            except Exception as e:
+                logger.warning(f"Could not create directory {missing_dir}: {str(e)}")
+    
+    def create_remote_directories(self, remote_dirs: Set[str]):
+        """Create missing directories with a few remote `mkdir -p` calls, falling back to SFTP"""
+        needed = sorted(d for d in remote_dirs if d not in self._known_remote_dirs)
+        for i in range(0, len(needed), MKDIR_BATCH_SIZE):
+            batch = needed[i:i + MKDIR_BATCH_SIZE]
             try:
-                logger.info(f"Creating remote directory: {remote_dir}")
-                self.sftp_client.mkdir(remote_dir)
+                stdin, stdout, stderr = self.ssh_client.exec_command(
+                    'mkdir -p ' + ' '.join(shlex.quote(d) for d in batch)
+                )
+                exit_status = stdout.channel.recv_exit_status()
             except Exception as e:
-                logger.warning(f"Could not create directory {remote_dir}: {str(e)}")
+                logger.warning(f"Remote mkdir failed: {str(e)}")
+                exit_status = -1
+            
+            if exit_status == 0:
+                logger.info(f"Created {len(batch)} remote directories")
+                self._known_remote_dirs.update(batch)
+            else:
+                # No usable shell (e.g. an SFTP-only account); walk the tree over SFTP
+                for remote_dir in batch:
+                    self.create_remote_directory(remote_dir)
+    
+    def build_remote_index(self):
+        """List the remote tree once so unchanged files can be skipped"""
+        self._remote_index = {}
+        stack = [self.remote_path]
+        
+        # One listdir_attr round-trip per directory returns every entry's size and mtime
+        while stack:
+            remote_dir = stack.pop()
+            try:
+                entries = self.sftp_client.listdir_attr(remote_dir or '.')
+            except FileNotFoundError:
+                continue
+            if remote_dir:
+                self._known_remote_dirs.add(remote_dir)
+            for entry in entries:
+                if self._should_exclude_name(entry.filename):
+                    continue
+                remote_file = posixpath.join(remote_dir, entry.filename)
+                if stat.S_ISDIR(entry.st_mode):
+                    stack.append(remote_file)
+                else:
+                    self._remote_index[remote_file] = entry
+    
+    def is_unchanged(self, local_stat: os.stat_result, remote_file: str) -> bool:
+        """Check if the remote copy has the same size and mtime as the local file"""
+        remote_attrs = self._remote_index.get(remote_file)
+        if remote_attrs is None:
+            return False
+        # SFTP carries whole-second mtimes
+        return (remote_attrs.st_size == local_stat.st_size
+                and int(remote_attrs.st_mtime) == int(local_stat.st_mtime))
+    
+    def put_pipelined(self, sftp_client: paramiko.SFTPClient, local_file: str, remote_file: str):
+        """Write a file without waiting for each WRITE to be acknowledged"""
+        # Unbuffered, so the whole file goes out as back-to-back WRITE requests;
+        # close() collects the acknowledgements and raises on any failure
+        with open(local_file, 'rb', buffering=0) as local, sftp_client.file(remote_file, 'wb', bufsize=0) as remote:
+            remote.set_pipelined(True)
+            # Large files are read a chunk at a time instead of whole into memory
+            for chunk in iter(lambda: local.read(READ_CHUNK_SIZE), b''):
+                remote.write(chunk)
     
-    def upload_file(self, local_file: Path, remote_file: str) -> bool:
+    def upload_file(self, local_file: str, remote_file: str,
+                    sftp_client: Optional[paramiko.SFTPClient] = None, ensure_dir: bool = True,
+                    local_stat: Optional[os.stat_result] = None) -> bool:
         """Upload a single file to the remote server"""
+        if sftp_client is None:
+            with self.borrow_sftp_client() as borrowed:
+                return self.upload_file(local_file, remote_file, borrowed, ensure_dir, local_stat)
+        
         try:
             # Create remote directory if needed
             remote_dir = os.path.dirname(remote_file)
-            if remote_dir:
+            if ensure_dir and remote_dir:
                 self.create_remote_directory(remote_dir)
             
             # Upload file
-            logger.info(f"Uploading: {local_file.name} -> {remote_file}")
-            self.sftp_client.put(str(local_file), remote_file)
+            logger.info(f"Uploading: {os.path.basename(local_file)} -> {remote_file}")
+            # Callers that scanned the tree pass the DirEntry's cached stat
+            if local_stat is None:
+                local_stat = os.stat(local_file)
+            self.put_pipelined(sftp_client, local_file, remote_file)
+            
+            # Copy the local mtime so the next run sees the file as unchanged
+            sftp_client.utime(remote_file, (local_stat.st_atime, local_stat.st_mtime))
+            
+            # Make scripts executable later in one batched chmod
+            if os.path.splitext(local_file)[1] in ['.py', '.sh']:
+                self._pending_chmod.append(remote_file)
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to upload {local_file}: {str(e)}")
+            return False
+    
+    async def upload_files_async(self, files_to_upload: List[str], remote_files: List[str],
+                                 report: Callable[[str, bool], None]):
+        """Upload files concurrently over one asyncssh SFTP session"""
+        async with asyncssh.connect(self.hostname, port=self.port, username=self.username,
+                                    password=self.password, known_hosts=None) as conn:
+            async with conn.start_sftp_client() as sftp:
+                # Bound the open remote handles the same way the thread pool does
+                limit = asyncio.Semaphore(self.workers)
+                
+                async def upload(local_file: str, remote_file: str):
+                    async with limit:
+                        try:
+                            logger.info(f"Uploading: {os.path.basename(local_file)} -> {remote_file}")
+                            # preserve copies the mtime so the next run sees the file as unchanged
+                            await sftp.put(local_file, remote_file, preserve=True,
+                                           max_requests=ASYNC_MAX_REQUESTS)
+                        except (OSError, asyncssh.Error) as e:
+                            logger.error(f"Failed to upload {local_file}: {str(e)}")
+                            report(local_file, False)
+                            return
+                    if os.path.splitext(local_file)[1] in ['.py', '.sh']:
+                        self._pending_chmod.append(remote_file)
+                    report(local_file, True)
+                
+                await asyncio.gather(*(upload(f, r) for f, r in zip(files_to_upload, remote_files)))
+    
+    def apply_pending_chmod(self):
+        """Make all uploaded scripts executable with a few shell calls instead of one SFTP request each"""
+        pending, self._pending_chmod = self._pending_chmod, []
+        for i in range(0, len(pending), CHMOD_BATCH_SIZE):
+            batch = pending[i:i + CHMOD_BATCH_SIZE]
+            try:
+                stdin, stdout, stderr = self.ssh_client.exec_command(
+                    'chmod 755 ' + ' '.join(shlex.quote(path) for path in batch)
+                )
+                if stdout.channel.recv_exit_status() == 0:
+                    continue
+            except Exception as e:
+                logger.warning(f"Remote chmod failed: {str(e)}")
             
-            # Set file permissions (make Python scripts executable)
-            if local_file.suffix in ['.py', '.sh']:
+            # No usable shell; fall back to one SFTP chmod per script
+            for remote_file in batch:
                 try:
                     self.sftp_client.chmod(remote_file, 0o755)
                 except Exception as e:
                     logger.warning(f"Could not set permissions for {remote_file}: {str(e)}")
+    
+    def _scandir_recursive(self, path: str) -> Iterator[os.DirEntry]:
+        """Yield the DirEntry of every file under path that isn't excluded"""
+        # An explicit stack rather than nested generators, so each entry is
+        # yielded once instead of being relayed up through every level
+        stack = [path]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # Excluded directories are rejected before they are ever opened,
+                    # so only the entry's own name needs checking
+                    if self._should_exclude_name(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+    
+    def upload_tar(self, local_files: List[Tuple[str, str]]) -> bool:
+        """Upload many small files, given with their relative paths, as one gzipped tar stream"""
+        logger.info(f"Streaming {len(local_files)} small files through tar")
+        
+        def set_mode(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+            # Match upload_file, which makes scripts executable
+            if os.path.splitext(tarinfo.name)[1] in ['.py', '.sh']:
+                tarinfo.mode = 0o755
+            return tarinfo
+        
+        # An empty remote path means the login directory, as it does for SFTP
+        remote_root = shlex.quote(self.remote_path or '.')
+        try:
+            # No -m: the archived mtimes must land on the remote files for incremental uploads
+            stdin, stdout, stderr = self.ssh_client.exec_command(f"mkdir -p {remote_root} && tar -xzf - -C {remote_root}")
+            with tarfile.open(fileobj=stdin, mode='w|gz') as tar:
+                for local_file, arcname in local_files:
+                    tar.add(local_file, arcname=arcname, recursive=False, filter=set_mode)
+            stdin.channel.shutdown_write()
             
+            exit_status = stdout.channel.recv_exit_status()
+            if exit_status != 0:
+                logger.warning(f"Remote tar exited with {exit_status}: {stderr.read().decode(errors='replace').strip()}")
+                return False
             return True
-            
         except Exception as e:
-            logger.error(f"Failed to upload {local_file}: {str(e)}")
+            logger.warning(f"Tar upload failed: {str(e)}")
             return False
     
-    def get_files_to_upload(self) -> List[Path]:
-        """Get list of all files to upload"""
+    def get_files_to_upload(self) -> List[Tuple[str, str, os.stat_result]]:
+        """Get list of all files to upload with their relative POSIX paths and stat results"""
+        root = str(self.local_path)
+        # Every entry path starts with root plus a separator, so the relative path is a slice
+        prefix_len = len(os.path.join(root, ''))
         files_to_upload = []
-        
-        for root, dirs, files in os.walk(self.local_path):
-            root_path = Path(root)
-            
-            # Filter out excluded directories
-            dirs[:] = [d for d in dirs if not self.should_exclude(root_path / d)]
-            
-            for file in files:
-                file_path = root_path / file
-                if not self.should_exclude(file_path):
-                    files_to_upload.append(file_path)
-        
+        for entry in self._scandir_recursive(root):
+            relative_path = entry.path[prefix_len:]
+            if os.sep != '/':
+                relative_path = relative_path.replace(os.sep, '/')
+            # DirEntry.stat() is cached on the entry, so each file is stat'ed at most once
+            files_to_upload.append((entry.path, relative_path, entry.stat()))
         return files_to_upload
     
-    def preview_upload(self) -> List[Path]:
+    def preview_upload(self) -> List[Tuple[str, str, os.stat_result]]:
         """Preview what files would be uploaded"""
         files_to_upload = self.get_files_to_upload()
         
         print(f"\nFiles to be uploaded ({len(files_to_upload)} files):")
         print("-" * 60)
         
-        for file_path in sorted(files_to_upload):
-            relative_path = file_path.relative_to(self.local_path)
-            file_size = file_path.stat().st_size
+        # One pass builds the listing and the total from the stats cached during the scan
+        files_to_upload.sort(key=itemgetter(1))
+        total_size = 0
+        lines = []
+        for _, relative_path, file_stat in files_to_upload:
+            file_size = file_stat.st_size
+            total_size += file_size
             size_str = f"{file_size:,} bytes" if file_size < 1024 else f"{file_size/1024:.1f} KB"
-            print(f"  {relative_path} ({size_str})")
+            lines.append(f"  {relative_path} ({size_str})")
+        if lines:
+            print("\n".join(lines))
         
         print("-" * 60)
-        total_size = sum(f.stat().st_size for f in files_to_upload)
         total_str = f"{total_size:,} bytes" if total_size < 1024*1024 else f"{total_size/(1024*1024):.1f} MB"
         print(f"Total: {len(files_to_upload)} files, {total_str}")
         
@@ -325,9 +581,9 @@ class SFTPUploader:
             return False
         
         # Preview files to upload
-        files_to_upload = self.preview_upload()
+        files_with_stats = self.preview_upload()
         
-        if not files_to_upload:
+        if not files_with_stats:
             logger.info("No files to upload")
             return True
         
@@ -343,26 +599,91 @@ class SFTPUploader:
             return False
         
         try:
+            # Calculate remote paths once from the relative paths found during the scan
+            remote_root = self.remote_path.replace('\\', '/')
+            relative_by_file = {file_path: relative_path for file_path, relative_path, _ in files_with_stats}
+            stat_by_file = {file_path: file_stat for file_path, _, file_stat in files_with_stats}
+            remote_by_file = {
+                file_path: posixpath.join(remote_root, relative_path)
+                for file_path, relative_path, _ in files_with_stats
+            }
+            
+            # Skip files whose remote copy already matches
+            if not self.force:
+                self.build_remote_index()
+                changed = [
+                    (file_path, relative_path, file_stat) for file_path, relative_path, file_stat in files_with_stats
+                    if not self.is_unchanged(file_stat, remote_by_file[file_path])
+                ]
+                skipped = len(files_with_stats) - len(changed)
+                if skipped:
+                    print(f"\nSkipping {skipped} unchanged files")
+                files_with_stats = changed
+            # Dispatch largest first so one big file doesn't finish alone after the workers drain
+            files_with_stats.sort(key=lambda item: item[2].st_size, reverse=True)
+            files_to_upload = [file_path for file_path, _, _ in files_with_stats]
+            
             # Upload files
             uploaded_count = 0
             failed_count = 0
             
-            print(f"\nUploading {len(files_to_upload)} files...")
+            total = len(files_to_upload)
+            print(f"\nUploading {total} files...")
             print("=" * 60)
             
-            for i, file_path in enumerate(files_to_upload, 1):
-                # Calculate relative path
-                relative_path = file_path.relative_to(self.local_path)
-                remote_file_path = os.path.join(self.remote_path, str(relative_path)).replace('\\', '/')
-                
-                print(f"[{i:3d}/{len(files_to_upload)}] ", end="")
-                
-                if self.upload_file(file_path, remote_file_path):
-                    uploaded_count += 1
-                    print("✓")
+            # Small files go in one streamed tar; SFTP handles the rest, or everything if tar fails
+            if self.tar_small_files:
+                small = [
+                    (file_path, relative_path) for file_path, relative_path, file_stat in files_with_stats
+                    if file_stat.st_size < TAR_THRESHOLD
+                ]
+                if len(small) > 1 and self.upload_tar(small):
+                    uploaded_count = len(small)
+                    print(f"[{uploaded_count:3d}/{total}] {uploaded_count} small files via tar ✓")
+                    sent = {file_path for file_path, _ in small}
+                    files_to_upload = [f for f in files_to_upload if f not in sent]
+            remote_files = [remote_by_file[file_path] for file_path in files_to_upload]
+            
+            # Create the directory tree up front so workers only put
+            self.create_remote_directories({os.path.dirname(r) for r in remote_files} - {''})
+            
+            progress_lock = threading.Lock()
+            finished: Set[str] = set()
+            
+            def report(file_path: str, ok: bool):
+                nonlocal uploaded_count, failed_count
+                with progress_lock:
+                    finished.add(file_path)
+                    if ok:
+                        uploaded_count += 1
+                    else:
+                        failed_count += 1
+                    done = uploaded_count + failed_count
+                    print(f"[{done:3d}/{total}] {relative_by_file[file_path]} {'✓' if ok else '✗'}")
+            
+            if self.use_asyncssh and files_to_upload:
+                if not ASYNCSSH_AVAILABLE:
+                    logger.warning("SFTP_ASYNC is set but asyncssh is not installed; using paramiko")
                 else:
-                    failed_count += 1
-                    print("✗")
+                    try:
+                        asyncio.run(self.upload_files_async(files_to_upload, remote_files, report))
+                    except (OSError, asyncssh.Error) as e:
+                        logger.warning(f"asyncssh upload failed, continuing with paramiko: {str(e)}")
+                    # Anything the async session didn't get to goes through the thread pool
+                    remaining = [(f, r) for f, r in zip(files_to_upload, remote_files) if f not in finished]
+                    files_to_upload = [f for f, _ in remaining]
+                    remote_files = [r for _, r in remaining]
+            
+            # Upload files, each worker borrowing an idle SFTP channel
+            def upload(file_path: str, remote_file_path: str):
+                ok = self.upload_file(file_path, remote_file_path, ensure_dir=False,
+                                      local_stat=stat_by_file[file_path])
+                report(file_path, ok)
+            
+            with ThreadPoolExecutor(max_workers=len(self.sftp_clients)) as executor:
+                list(executor.map(upload, files_to_upload, remote_files))
+            
+            self.apply_pending_chmod()
             
             print("=" * 60)
             logger.info(f"Upload completed: {uploaded_count} uploaded, {failed_count} failed")
@@ -390,6 +711,7 @@ def main():
             print("  python upload_all_files.py           Upload all files")
             print("  python upload_all_files.py --help    Show this help")
             print("  python upload_all_files.py --clear   Clear saved credentials")
+            print("  python upload_all_files.py --force   Upload unchanged files too")
             print()
             print("This script will:")
             print("  1. Load saved credentials if available (or prompt for new ones)")
@@ -397,11 +719,15 @@ def main():
             print("  3. Upload all files to the remote server")
             print("  4. Maintain directory structure")
             print("  5. Skip common excluded files (.git, __pycache__, etc.)")
+            print("  6. Skip files whose remote size and mtime already match")
             print()
             print("Environment Variables:")
             print("  SFTP_HOST         - Remote server hostname")
             print("  SFTP_PORT         - SSH port (default: 22)")
             print("  SFTP_REMOTE_PATH  - Remote directory path (default: empty)")
+            print("  SFTP_WORKERS      - Parallel SFTP channels (default: 4)")
+            print("  SFTP_TAR_SMALL_FILES - Send files under 64 KB as one tar stream (default: 1)")
+            print("  SFTP_ASYNC        - Upload over asyncssh when installed (default: 0)")
             print()
             print("Credentials are saved in .upload_config (excluded from upload)")
             return
@@ -414,6 +740,7 @@ def main():
     print("SFTP File Upload Script")
     print("=" * 40)
     uploader = SFTPUploader()
+    uploader.force = '--force' in sys.argv[1:]
     print(f"Target Server: {uploader.hostname}:{uploader.port}")
     print(f"Local Directory: {Path.cwd()}")
     print()
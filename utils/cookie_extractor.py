@@ -21,6 +21,16 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Fallback cookies written when browser extraction isn't possible
+_BASIC_COOKIES = (
+    "# Netscape HTTP Cookie File",
+    "# This file was generated by DetendezBot (basic mode)",
+    "# Some YouTube videos may still be restricted",
+    ".youtube.com\tTRUE\t/\tFALSE\t0\tCONSENT\tYES+",
+    ".youtube.com\tTRUE\t/\tFALSE\t0\tVISITOR_INFO1_LIVE\t",
+    ".youtube.com\tTRUE\t/\tTRUE\t0\tYSC\t",
+)
+
 class YouTubeCookieExtractor:
     """Extract YouTube cookies using multiple methods for yt-dlp"""
     
@@ -62,10 +72,10 @@ class YouTubeCookieExtractor:
     
     def _cookies_are_fresh(self):
         """Check if cached cookies are still fresh"""
-        if not os.path.exists(self.cookies_file):
+        try:
+            file_age = time.time() - os.stat(self.cookies_file).st_mtime
+        except FileNotFoundError:
             return False
-        
-        file_age = time.time() - os.path.getmtime(self.cookies_file)
         return file_age < self.cookies_cache_duration
     
     def _selenium_cookies_to_netscape(self, selenium_cookies):
@@ -89,15 +99,7 @@ class YouTubeCookieExtractor:
     
     def _create_basic_cookies(self):
         """Create basic YouTube cookies without browser automation"""
-        basic_cookies = [
-            "# Netscape HTTP Cookie File",
-            "# This file was generated by DetendezBot (basic mode)",
-            "# Some YouTube videos may still be restricted",
-            ".youtube.com\tTRUE\t/\tFALSE\t0\tCONSENT\tYES+",
-            ".youtube.com\tTRUE\t/\tFALSE\t0\tVISITOR_INFO1_LIVE\t",
-            ".youtube.com\tTRUE\t/\tTRUE\t0\tYSC\t",
-        ]
-        return basic_cookies
+        return _BASIC_COOKIES
     
     async def extract_cookies(self, force_refresh=False):
         """Extract YouTube cookies using available methods"""
@@ -115,10 +117,11 @@ class YouTubeCookieExtractor:
                 cookies_content = await self._extract_cookies_selenium()
                 if cookies_content:
                     # Write cookies to file
-                    with open(self.cookies_file, 'w', encoding='utf-8') as f:
-                        f.write("# Netscape HTTP Cookie File\n")
-                        f.write("# This file was generated by DetendezBot (selenium mode)\n")
-                        f.write("\n".join(cookies_content))
+                    await self._write_cookies(
+                        "# Netscape HTTP Cookie File\n"
+                        "# This file was generated by DetendezBot (selenium mode)\n"
+                        + "\n".join(cookies_content)
+                    )
                     
                     logger.info("YouTube cookies extracted successfully using selenium")
                     return self.cookies_file
@@ -130,8 +133,7 @@ class YouTubeCookieExtractor:
         try:
             basic_cookies = self._create_basic_cookies()
             
-            with open(self.cookies_file, 'w', encoding='utf-8') as f:
-                f.write("\n".join(basic_cookies))
+            await self._write_cookies("\n".join(basic_cookies))
             
             logger.info("Basic YouTube cookies created")
             return self.cookies_file
@@ -146,6 +148,27 @@ class YouTubeCookieExtractor:
             
             return None
     
+    async def _write_cookies(self, content):
+        """Write the cookies file without blocking the event loop (runs in executor)"""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._write_cookies_sync, content)
+    
+    def _write_cookies_sync(self, content):
+        """Write the cookies file, only touching it if the content is unchanged"""
+        try:
+            with open(self.cookies_file, 'r', encoding='utf-8') as f:
+                unchanged = f.read() == content
+        except FileNotFoundError:
+            unchanged = False
+        
+        if unchanged:
+            # Refresh the mtime so _cookies_are_fresh treats it as newly extracted
+            os.utime(self.cookies_file)
+            return
+        
+        with open(self.cookies_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
     async def _extract_cookies_selenium(self):
         """Extract cookies using selenium (runs in executor)"""
         loop = asyncio.get_event_loop()
@@ -214,12 +237,14 @@ class YouTubeCookieExtractor:
     
     async def cleanup_old_cookies(self):
         """Clean up old cookie files"""
+        # One stat instead of exists() + getmtime(); a missing file just means nothing to clean
+        threshold = time.time() - 86400  # 24 hours
         try:
-            if os.path.exists(self.cookies_file):
-                file_age = time.time() - os.path.getmtime(self.cookies_file)
-                if file_age > 86400:  # 24 hours
-                    os.remove(self.cookies_file)
-                    logger.info("Cleaned up old cookie file")
+            if os.stat(self.cookies_file).st_mtime < threshold:
+                os.remove(self.cookies_file)
+                logger.info("Cleaned up old cookie file")
+        except FileNotFoundError:
+            return
         except Exception as e:
             logger.error(f"Error cleaning up cookies: {e}")
     